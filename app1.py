@@ -3,25 +3,42 @@ from flask import Flask
 app = Flask(__name__)
 app.secret_key = "your_secret_key_here_change_in_production"
 
+from db import init_db
+from sql_metrics import init_sql_metrics
+init_db(app)
+init_sql_metrics(app)
+
 # Import and register routes
 from routes_select import init_select_routes
 from routes_add_course import init_add_course_routes
+from routes_import_courses import init_import_courses_routes
 from routes_view_courses import init_view_courses_routes
 from routes_time_slots import init_time_slots_routes
 from routes_assign_courses import init_assign_courses_routes
 from routes_classrooms import init_classroom_routes
 from routes_view_routine import init_view_routine_routes
+from routes_routine_api import init_routine_api_routes
+from routes_teacher import init_teacher_routes
+from routes_export import init_export_routes
+from routes_quality import init_quality_routes
 from routes_exit import init_exit_routes
+from routes_status import init_status_routes
 
 # Initialize routes
 init_select_routes(app)
 init_add_course_routes(app)
+init_import_courses_routes(app)
 init_view_courses_routes(app)
 init_time_slots_routes(app)
 init_assign_courses_routes(app)
 init_classroom_routes(app)
 init_view_routine_routes(app)
+init_routine_api_routes(app)
+init_teacher_routes(app)
+init_export_routes(app)
+init_quality_routes(app)
 init_exit_routes(app)
+init_status_routes(app)
 
 if __name__ == "__main__":
     app.run(debug=False)  # Set to False in production
\ No newline at end of file
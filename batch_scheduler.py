@@ -0,0 +1,130 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from routine_grid import load_grid, load_course_lists, write_grid
+from scheduling import schedule_grid
+
+BATCH_WORKERS = int(os.environ.get("BATCH_WORKERS", str(os.cpu_count() or 1)))
+
+
+def discover_sections(cur):
+    """Table prefixes that have both a `_courses` and a `_routine` table."""
+    cur.execute("SHOW TABLES")
+    tables = {row[0] for row in cur.fetchall()}
+    return sorted(
+        t[:-len("_courses")] for t in tables
+        if t.endswith("_courses") and t[:-len("_courses")] + "_routine" in tables
+    )
+
+
+def add_busy(busy, grid):
+    """Record every assigned cell of a grid in a teacher -> day -> [(start, end)] occupancy index."""
+    for day in grid.days:
+        for cell in grid.cells[day]:
+            if cell["teacher"] is not None and not cell["is_break"]:
+                busy.setdefault(cell["teacher"], {}).setdefault(day, []).append((cell["start"], cell["end"]))
+    return busy
+
+
+def merge_busy(busy, other):
+    for teacher, days in other.items():
+        for day, intervals in days.items():
+            busy.setdefault(teacher, {}).setdefault(day, []).extend(intervals)
+    return busy
+
+
+def section_teachers(section):
+    return {row[0] for row in section["labs"] + section["tutorials"]}
+
+
+def teacher_components(sections):
+    """Group sections that share a teacher (transitively); groups are independent of each other."""
+    parent = list(range(len(sections)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    first_section = {}
+    for i, section in enumerate(sections):
+        for teacher in section_teachers(section):
+            if teacher in first_section:
+                parent[find(i)] = find(first_section[teacher])
+            else:
+                first_section[teacher] = i
+
+    groups = {}
+    for i in range(len(sections)):
+        groups.setdefault(find(i), []).append(sections[i])
+    return list(groups.values())
+
+
+def schedule_component(sections, fixed_busy, seed, time_limit):
+    """Schedule sections that share teachers one after another against a shared occupancy index."""
+    busy = {t: {d: list(iv) for d, iv in days.items()} for t, days in fixed_busy.items()}
+    results = []
+    ordered = sorted(sections, key=lambda s: -sum(row[3] for row in s["labs"] + s["tutorials"]))
+    for section in ordered:
+        grid = section["grid"]
+        # schedule_grid clears the grid; if this section fails, its table keeps these placements
+        held = add_busy({}, grid)
+        outcome = schedule_grid(grid, section["labs"], section["tutorials"], engine="solver",
+                                seed=seed, time_limit=time_limit, teacher_busy=busy)
+        if outcome.status == "complete":
+            add_busy(busy, grid)
+        else:
+            merge_busy(busy, held)
+        results.append({
+            "routine_table": section["routine_table"],
+            "status": outcome.status,
+            "report": outcome.report,
+            "grid": grid if outcome.status == "complete" else None,
+        })
+    return results
+
+
+def run_batch(conn, seed=0, time_limit=5.0, workers=BATCH_WORKERS, prefixes=None):
+    """Reschedule every section in one pass without double-booking teachers across sections.
+
+    Sections outside `prefixes` keep their timetable and count as fixed teacher
+    occupancy. Sections that fail to schedule are reported and left unchanged.
+    """
+    cur = conn.cursor()
+    all_prefixes = discover_sections(cur)
+    selected = [p for p in all_prefixes if prefixes is None or p in prefixes]
+
+    sections = []
+    fixed_busy = {}
+    for prefix in all_prefixes:
+        grid = load_grid(cur, f"{prefix}_routine")
+        if prefix not in selected:
+            add_busy(fixed_busy, grid)
+            continue
+        labs, tutorials = load_course_lists(cur, f"{prefix}_courses", grid.slot_minutes())
+        sections.append({"routine_table": f"{prefix}_routine", "grid": grid, "labs": labs, "tutorials": tutorials})
+
+    components = teacher_components(sections)
+    results = []
+    if workers > 1 and len(components) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(components))) as pool:
+            futures = [pool.submit(schedule_component, c, fixed_busy, seed, time_limit) for c in components]
+            for future in futures:
+                results.extend(future.result())
+    else:
+        for component in components:
+            results.extend(schedule_component(component, fixed_busy, seed, time_limit))
+
+    for result in results:
+        if result["grid"] is not None:
+            write_grid(cur, result["routine_table"], result["grid"])
+    conn.commit()
+    cur.close()
+
+    return {
+        "components": len(components),
+        "sections": [
+            {"routine_table": r["routine_table"], "status": r["status"], **r["report"]}
+            for r in results
+        ],
+    }
@@ -0,0 +1,199 @@
+"""Scheduler benchmark: time_slots, assign_courses and classroom_assignment at growing scale.
+
+Each scale generates synthetic sections, runs the same steps the routes run
+against an SQLite stand-in and records wall time, statement count, placement
+success rate and peak traced memory per phase. Results are written as JSON so
+runs can be compared across commits.
+
+    python benchmarks/bench_scheduler.py --scales 10,100,1000 --output bench.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from routine_grid import (  # noqa: E402
+    build_day_template, build_slot_rows, days_between, load_grid, write_grid, load_course_lists
+)
+from scheduling import schedule_grid  # noqa: E402
+from room_allocator import load_room_occupancy, allocate_rooms, grid_sessions  # noqa: E402
+from standin import StandinConnection  # noqa: E402
+from generators import generate_sections, day_span  # noqa: E402
+
+
+def setup_courses(conn, prefix, courses):
+    cur = conn.cursor()
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {prefix}_courses (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            teacher_name VARCHAR(100) NOT NULL,
+            course_name VARCHAR(100) NOT NULL,
+            course_code VARCHAR(50) NOT NULL,
+            tutorial_time VARCHAR(20) NULL,
+            lab_time VARCHAR(20) NULL,
+            tutorials_per_week INTEGER DEFAULT 0,
+            labs_per_week INTEGER DEFAULT 0
+        )
+    """)
+    cur.executemany(f"""
+        INSERT INTO {prefix}_courses
+        (teacher_name, course_name, course_code, tutorial_time, lab_time, tutorials_per_week, labs_per_week)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """, courses)
+    conn.commit()
+    cur.close()
+
+
+def phase_time_slots(conn, prefix, args):
+    routine_table = f"{prefix}_routine"
+    cur = conn.cursor()
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {routine_table} (
+            day VARCHAR(20),
+            time_slot VARCHAR(100),
+            slot_start TIME,
+            slot_end TIME,
+            teacher_name VARCHAR(100) DEFAULT NULL,
+            course_code VARCHAR(50) DEFAULT NULL,
+            is_lab BOOLEAN DEFAULT FALSE,
+            classroom VARCHAR(20) DEFAULT NULL,
+            PRIMARY KEY (day, slot_start)
+        )
+    """)
+    start_day, end_day = day_span(args.days)
+    template = build_day_template(args.start, args.end, args.slot_minutes, args.break_start, args.break_end)
+    rows = build_slot_rows(days_between(start_day, end_day), template)
+    cur.execute(f"DELETE FROM {routine_table}")
+    cur.executemany(
+        f"INSERT INTO {routine_table} (day, time_slot, slot_start, slot_end) VALUES (%s, %s, %s, %s)", rows
+    )
+    conn.commit()
+    cur.close()
+    return len(rows), len(rows)
+
+
+def phase_assign_courses(conn, prefix, args):
+    cur = conn.cursor()
+    grid = load_grid(cur, f"{prefix}_routine")
+    labs, tutorials = load_course_lists(cur, f"{prefix}_courses", grid.slot_minutes())
+    outcome = schedule_grid(grid, labs, tutorials, engine=args.engine, seed=args.seed, time_limit=args.time_limit)
+    if outcome.writable:
+        write_grid(cur, f"{prefix}_routine", grid)
+    conn.commit()
+    cur.close()
+    return outcome.report["placed"], outcome.report["required"]
+
+
+def phase_classroom_assignment(conn, prefix, args):
+    routine_table = f"{prefix}_routine"
+    cur = conn.cursor()
+    occupancy = load_room_occupancy(cur, routine_table)
+    grid = load_grid(cur, routine_table)
+    for day in grid.days:
+        for cell in grid.cells[day]:
+            cell["classroom"] = None
+    tutorial_rooms = [f"T{i}" for i in range(args.tutorial_rooms)]
+    lab_rooms = [f"L{i}" for i in range(args.lab_rooms)]
+    total = len(grid_sessions(grid))
+    unassigned = allocate_rooms(grid, tutorial_rooms, lab_rooms, occupancy)
+    write_grid(cur, routine_table, grid)
+    conn.commit()
+    cur.close()
+    return total - len(unassigned), total
+
+
+PHASES = [
+    ("time_slots", phase_time_slots),
+    ("assign_courses", phase_assign_courses),
+    ("classroom_assignment", phase_classroom_assignment),
+]
+
+
+def run_scale(n_courses, args):
+    conn = StandinConnection()
+    sections = generate_sections(
+        n_courses, args.courses_per_section, seed=args.seed,
+        lab_fraction=args.lab_fraction, tutorial_fraction=args.tutorial_fraction,
+    )
+    for prefix, courses in sections:
+        setup_courses(conn, prefix, courses)
+
+    results = []
+    for name, phase in PHASES:
+        conn.queries = 0
+        done = total = 0
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        for prefix, _ in sections:
+            d, t = phase(conn, prefix, args)
+            done += d
+            total += t
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append({
+            "courses": n_courses,
+            "sections": len(sections),
+            "phase": name,
+            "wall_seconds": round(elapsed, 6),
+            "queries": conn.queries,
+            "success_rate": round(done / total, 4) if total else 1.0,
+            "peak_memory_kb": round(peak / 1024, 1),
+        })
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="10,100,1000", help="comma-separated total course counts")
+    parser.add_argument("--courses-per-section", type=int, default=8)
+    parser.add_argument("--lab-fraction", type=float, default=0.4)
+    parser.add_argument("--tutorial-fraction", type=float, default=0.8)
+    parser.add_argument("--slot-minutes", type=int, default=60)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--start", default="09:00")
+    parser.add_argument("--end", default="17:00")
+    parser.add_argument("--break-start", default="13:00")
+    parser.add_argument("--break-end", default="14:00")
+    parser.add_argument("--tutorial-rooms", type=int, default=20)
+    parser.add_argument("--lab-rooms", type=int, default=10)
+    parser.add_argument("--engine", choices=["random", "solver"], default="random")
+    parser.add_argument("--time-limit", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+        for row in run_scale(scale, args):
+            results.append(row)
+            print(f"{row['courses']:6d} courses  {row['phase']:22s} {row['wall_seconds'] * 1000:10.1f} ms "
+                  f"{row['queries']:7d} queries  {row['success_rate'] * 100:6.1f}% placed "
+                  f"{row['peak_memory_kb']:10.1f} KiB peak")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "params": vars(args),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Row-insert throughput for /time-slots grid generation: per-row execute vs executemany.
+
+Runs against an in-memory SQLite stand-in; --latency-ms adds a simulated network
+round trip to every statement sent, which is what dominates against remote MySQL.
+
+    python benchmarks/bench_time_slots.py --latency-ms 2
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from routine_grid import build_day_template, build_slot_rows, days_between  # noqa: E402
+
+
+class RoundTripCursor:
+    """sqlite3 cursor that sleeps once per statement sent to the 'server'."""
+
+    def __init__(self, cur, latency):
+        self._cur = cur
+        self._latency = latency
+        self.round_trips = 0
+
+    def execute(self, sql, params=()):
+        self.round_trips += 1
+        time.sleep(self._latency)
+        return self._cur.execute(sql.replace("%s", "?"), [str(p) for p in params])
+
+    def executemany(self, sql, seq):
+        self.round_trips += 1
+        time.sleep(self._latency)
+        return self._cur.executemany(sql.replace("%s", "?"), [[str(p) for p in row] for row in seq])
+
+
+def make_table(conn):
+    conn.execute("""
+        CREATE TABLE routine (
+            day VARCHAR(20), time_slot VARCHAR(100), slot_start TIME, slot_end TIME,
+            teacher_name VARCHAR(100), course_code VARCHAR(50), is_lab BOOLEAN DEFAULT FALSE,
+            classroom VARCHAR(20), PRIMARY KEY (day, slot_start)
+        )
+    """)
+
+
+def per_row(cur, rows):
+    cur.execute("DELETE FROM routine")
+    for row in rows:
+        cur.execute("INSERT INTO routine (day, time_slot, slot_start, slot_end) VALUES (%s, %s, %s, %s)", row)
+
+
+def bulk(cur, rows):
+    cur.execute("DELETE FROM routine")
+    cur.executemany("INSERT INTO routine (day, time_slot, slot_start, slot_end) VALUES (%s, %s, %s, %s)", rows)
+
+
+def run(strategy, rows, latency, repeat):
+    best = None
+    trips = 0
+    for _ in range(repeat):
+        conn = sqlite3.connect(":memory:")
+        make_table(conn)
+        cur = RoundTripCursor(conn.cursor(), latency)
+        t0 = time.perf_counter()
+        strategy(cur, rows)
+        conn.commit()
+        elapsed = time.perf_counter() - t0
+        trips = cur.round_trips
+        best = elapsed if best is None else min(best, elapsed)
+        conn.close()
+    return best, trips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start-day", default="Monday")
+    parser.add_argument("--end-day", default="Saturday")
+    parser.add_argument("--start", default="08:00")
+    parser.add_argument("--end", default="20:00")
+    parser.add_argument("--slot", type=int, default=10)
+    parser.add_argument("--break-start", default="13:00")
+    parser.add_argument("--break-end", default="14:00")
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    template = build_day_template(args.start, args.end, args.slot, args.break_start, args.break_end)
+    rows = build_slot_rows(days_between(args.start_day, args.end_day), template)
+    latency = args.latency_ms / 1000.0
+
+    print(f"{len(rows)} rows, {args.latency_ms} ms simulated round trip")
+    results = {}
+    for name, strategy in (("per-row execute", per_row), ("executemany", bulk)):
+        elapsed, trips = run(strategy, rows, latency, args.repeat)
+        results[name] = elapsed
+        print(f"{name:16s} {elapsed * 1000:9.1f} ms  {trips:5d} round trips  {len(rows) / elapsed:10.0f} rows/s")
+    print(f"speedup: {results['per-row execute'] / results['executemany']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Parametrised synthetic inputs for the scheduler benchmarks."""
+import random
+from db import WEEK_DAYS
+
+
+def generate_courses(n_courses, lab_fraction=0.4, tutorial_fraction=0.8, lab_hours=(2, 3),
+                     tutorial_hours=(1,), max_per_week=3, teacher_pool=None, seed=0):
+    """Rows shaped like a courses table: (teacher, name, code, tutorial_time, lab_time, tutorials/wk, labs/wk)."""
+    rng = random.Random(seed)
+    teacher_pool = teacher_pool or max(1, n_courses // 2)
+    rows = []
+    for i in range(n_courses):
+        teacher = f"Teacher{rng.randrange(teacher_pool):04d}"
+        has_lab = rng.random() < lab_fraction
+        has_tutorial = rng.random() < tutorial_fraction or not has_lab
+        lab_time = f"{rng.choice(lab_hours)} hours" if has_lab else None
+        tutorial_time = f"{rng.choice(tutorial_hours)} hour" if has_tutorial else None
+        rows.append((
+            teacher, f"Course {i}", f"C{i:05d}",
+            tutorial_time, lab_time,
+            rng.randint(1, max_per_week) if has_tutorial else 0,
+            1 if has_lab else 0,
+        ))
+    return rows
+
+
+def generate_sections(total_courses, courses_per_section, seed=0, **course_kwargs):
+    """Split `total_courses` synthetic courses into sections sharing one teacher pool."""
+    n_sections = max(1, (total_courses + courses_per_section - 1) // courses_per_section)
+    teacher_pool = course_kwargs.pop("teacher_pool", None) or max(1, total_courses // 2)
+    sections = []
+    for s in range(n_sections):
+        count = min(courses_per_section, total_courses - s * courses_per_section)
+        courses = generate_courses(count, teacher_pool=teacher_pool, seed=seed * 100003 + s, **course_kwargs)
+        sections.append((f"bench_{s:04d}", courses))
+    return sections
+
+
+def day_span(n_days, start_day="Monday"):
+    s_idx = WEEK_DAYS.index(start_day)
+    return start_day, WEEK_DAYS[(s_idx + n_days - 1) % len(WEEK_DAYS)]
@@ -0,0 +1,27 @@
+"""Benchmark stand-in: the embedded SQLite backend with a count of statements sent."""
+from storage import SQLiteConnection, SQLiteCursor
+
+
+class CountingCursor(SQLiteCursor):
+    def __init__(self, conn):
+        super().__init__(conn._raw)
+        self._conn = conn
+
+    def execute(self, sql, params=()):
+        self._conn.queries += 1
+        super().execute(sql, params)
+
+    def executemany(self, sql, seq):
+        self._conn.queries += 1
+        super().executemany(sql, seq)
+
+
+class StandinConnection(SQLiteConnection):
+    """`queries` counts statements sent, standing in for round trips to MySQL."""
+
+    def __init__(self, path=":memory:"):
+        super().__init__(path)
+        self.queries = 0
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self)
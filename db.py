@@ -1,6 +1,9 @@
 import os
-import mysql.connector
-from mysql.connector import Error
+import threading
+import time
+from flask import g, has_app_context
+from sql_metrics import InstrumentedCursor
+from storage import MySQLBackend, SQLiteBackend
 
 # Database configuration for PythonAnywhere
 DB_HOST = 'Ppadak2005jitu.mysql.pythonanywhere-services.com'
@@ -9,18 +12,201 @@ DB_USER = 'Ppadak2005jitu'
 DB_PASSWORD = 'Cb2q64Jj'
 DB_PORT = '3306'
 
+# Storage backend: "mysql" (default) or "sqlite" for single-node deployments, tests and benchmarks
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "mysql")
+SQLITE_PATH = os.environ.get("SQLITE_PATH", ":memory:")
+
+# Connection pool configuration (per gunicorn worker)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "280"))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "1") != "0"
+
 WEEK_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
+
+class PoolError(Exception):
+    pass
+
+
+def make_backend(name=STORAGE_BACKEND):
+    if name == "sqlite":
+        return SQLiteBackend(SQLITE_PATH)
+    if name == "mysql":
+        return MySQLBackend(DB_HOST, DB_NAME, DB_USER, DB_PASSWORD, DB_PORT)
+    raise ValueError(f"Unknown STORAGE_BACKEND {name!r}")
+
+
+class PooledConnection:
+    """Proxy around a pooled connection; close() hands it back to the pool."""
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self.created_at = created_at
+        self.released = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._raw.cursor(*args, **kwargs))
+
+    def close(self):
+        if not self.released:
+            self.released = True
+            self._pool.release(self)
+
+
+class ConnectionPool:
+    """Bounded LIFO pool of backend connections with pre-ping and recycling."""
+
+    def __init__(self, backend, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT,
+                 recycle=DB_POOL_RECYCLE, pre_ping=DB_POOL_PRE_PING):
+        self.backend = backend
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self._idle = []
+        self._open = 0
+        self._cond = threading.Condition()
+        self.stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+            "creations": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+        }
+
+    def _is_stale(self, raw, created_at):
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            self.stats["recycled"] += 1
+            return True
+        if self.pre_ping:
+            try:
+                if not self.backend.is_alive(raw):
+                    self.stats["ping_failures"] += 1
+                    return True
+            except self.backend.Error:
+                self.stats["ping_failures"] += 1
+                return True
+        return False
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except self.backend.Error:
+            pass
+
+    def checkout(self):
+        deadline = time.monotonic() + self.timeout
+        waited_since = None
+        with self._cond:
+            self.stats["checkouts"] += 1
+            while True:
+                if self._idle:
+                    raw, created_at = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    raw, created_at = None, None
+                    break
+                if waited_since is None:
+                    waited_since = time.monotonic()
+                    self.stats["waits"] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats["timeouts"] += 1
+                    self.stats["wait_seconds"] += time.monotonic() - waited_since
+                    raise PoolError(f"No connection available after {self.timeout}s (pool size {self.size})")
+                self._cond.wait(remaining)
+            if waited_since is not None:
+                self.stats["wait_seconds"] += time.monotonic() - waited_since
+
+        if raw is not None and self._is_stale(raw, created_at):
+            self._discard(raw)
+            raw = None
+
+        if raw is None:
+            try:
+                raw = self.backend.connect()
+            except self.backend.Error:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                raise
+            created_at = time.monotonic()
+            with self._cond:
+                self.stats["creations"] += 1
+
+        return PooledConnection(self, raw, created_at)
+
+    def release(self, conn):
+        raw = conn._raw
+        try:
+            # Drop any uncommitted work so the next borrower starts clean
+            raw.rollback()
+            healthy = True
+        except self.backend.Error:
+            healthy = False
+            self._discard(raw)
+        with self._cond:
+            if healthy:
+                self._idle.append((raw, conn.created_at))
+            else:
+                self._open -= 1
+            self._cond.notify()
+
+    def snapshot(self):
+        with self._cond:
+            return dict(self.stats, size=self.size, open=self._open,
+                        idle=len(self._idle), in_use=self._open - len(self._idle))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(make_backend())
+    return _pool
+
+
+def get_backend():
+    return get_pool().backend
+
+
 def get_db_connection():
+    """Check a connection out of the pool; inside a request it is shared until teardown."""
+    pool = get_pool()
     try:
-        connection = mysql.connector.connect(
-            host=DB_HOST,
-            database=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            port=int(DB_PORT)
-        )
-        return connection
-    except Error as e:
-        print(f"Error connecting to MySQL: {e}")
-        return None
\ No newline at end of file
+        if has_app_context():
+            conn = g.get("_db_conn")
+            if conn is None or conn.released:
+                conn = g._db_conn = pool.checkout()
+            return conn
+        return pool.checkout()
+    except (pool.backend.Error, PoolError) as e:
+        print(f"Error connecting to {pool.backend.name}: {e}")
+        return None
+
+
+def release_db_connection(exc=None):
+    conn = g.pop("_db_conn", None)
+    if conn is not None:
+        conn.close()
+
+
+def pool_stats():
+    return get_pool().snapshot()
+
+
+def init_db(app):
+    app.teardown_appcontext(release_db_connection)
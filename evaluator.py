@@ -0,0 +1,183 @@
+"""Vectorised timetable quality metrics.
+
+Routines are encoded once into [batch, section, day, slot] arrays (-1 marks
+a free cell / no room); every metric is then a handful of NumPy reductions,
+so a stack of thousands of candidate grids can be scored in one call.
+"""
+import numpy as np
+from db import WEEK_DAYS
+
+# Weights for quality_score(); each metric counts "badness", lower is better
+DEFAULT_WEIGHTS = {
+    "unplaced_sessions": 1000.0,
+    "teacher_clashes": 1000.0,
+    "room_clashes": 1000.0,
+    "teacher_idle_gaps": 1.0,
+    "daily_load_variance": 1.0,
+    "lab_split_deviation": 2.0,
+    "labs_first_after_break": 2.0,
+}
+
+
+class Vocab:
+    """Name -> integer id tables; share one between encodings that will be stacked."""
+
+    def __init__(self):
+        self.teachers = {}
+        self.codes = {}
+        self.rooms = {}
+
+    @staticmethod
+    def id_of(table, name):
+        return table.setdefault(name, len(table))
+
+
+class EncodedRoutines:
+    def __init__(self, teacher, code, room, is_lab, is_break, valid, vocab, days, slot_starts):
+        self.teacher = teacher
+        self.code = code
+        self.room = room
+        self.is_lab = is_lab
+        self.is_break = is_break
+        self.valid = valid
+        self.vocab = vocab
+        self.days = days
+        self.slot_starts = slot_starts
+
+
+def encode_grids(grids, vocab=None, days=None, slot_starts=None):
+    """Encode RoutineGrids (one per section) as a batch of one; days and slots are aligned by start minute."""
+    vocab = vocab or Vocab()
+    if days is None:
+        present = {day for grid in grids for day in grid.days}
+        days = [day for day in WEEK_DAYS if day in present]
+    if slot_starts is None:
+        slot_starts = sorted({c["start"] for grid in grids for day in grid.days for c in grid.cells[day]})
+    day_index = {day: i for i, day in enumerate(days)}
+    slot_index = {start: i for i, start in enumerate(slot_starts)}
+
+    shape = (1, len(grids), len(days), len(slot_starts))
+    teacher = np.full(shape, -1, dtype=np.int32)
+    code = np.full(shape, -1, dtype=np.int32)
+    room = np.full(shape, -1, dtype=np.int32)
+    is_lab = np.zeros(shape, dtype=bool)
+    is_break = np.zeros(shape, dtype=bool)
+    valid = np.zeros(shape, dtype=bool)
+
+    for n, grid in enumerate(grids):
+        for day in grid.days:
+            d = day_index.get(day)
+            if d is None:
+                continue
+            for cell in grid.cells[day]:
+                s = slot_index.get(cell["start"])
+                if s is None:
+                    continue
+                valid[0, n, d, s] = True
+                if cell["is_break"]:
+                    is_break[0, n, d, s] = True
+                    continue
+                if cell["teacher"] is not None:
+                    teacher[0, n, d, s] = Vocab.id_of(vocab.teachers, cell["teacher"])
+                    code[0, n, d, s] = Vocab.id_of(vocab.codes, cell["code"])
+                    is_lab[0, n, d, s] = cell["is_lab"]
+                if cell["classroom"]:
+                    room[0, n, d, s] = Vocab.id_of(vocab.rooms, cell["classroom"])
+
+    return EncodedRoutines(teacher, code, room, is_lab, is_break, valid, vocab, days, slot_starts)
+
+
+def stack(encoded):
+    """Concatenate encodings (same vocab, days and slots) along the batch axis."""
+    first = encoded[0]
+    arrays = {
+        name: np.concatenate([getattr(e, name) for e in encoded])
+        for name in ("teacher", "code", "room", "is_lab", "is_break", "valid")
+    }
+    return EncodedRoutines(vocab=first.vocab, days=first.days, slot_starts=first.slot_starts, **arrays)
+
+
+def clashes(ids, count):
+    """Per batch item: cells beyond the first that hold the same id in the same (day, slot)."""
+    if count == 0:
+        return np.zeros(ids.shape[0], dtype=np.int64)
+    per_slot = (ids[..., None] == np.arange(count)).sum(axis=1)    # [B, D, S, count]
+    return np.maximum(per_slot - 1, 0).sum(axis=(1, 2, 3))
+
+
+def evaluate_encoded(enc, required_sessions=None):
+    """Metrics as arrays of shape [batch]; required_sessions is per section (or None to skip unplaced)."""
+    t, c, lab, brk, valid = enc.teacher, enc.code, enc.is_lab, enc.is_break, enc.valid
+    slots = t.shape[-1]
+    idx = np.arange(slots)
+    assigned = t >= 0
+
+    # A session starts where a cell is assigned and differs from the cell before it
+    continues = np.zeros_like(assigned)
+    continues[..., 1:] = (assigned[..., 1:] & (t[..., 1:] == t[..., :-1])
+                          & (c[..., 1:] == c[..., :-1]) & (lab[..., 1:] == lab[..., :-1]))
+    starts = assigned & ~continues
+    sessions = starts.sum(axis=(2, 3))                                # [B, N]
+
+    metrics = {"placed_sessions": sessions.sum(axis=1)}
+    if required_sessions is not None:
+        required = np.asarray(required_sessions)
+        metrics["unplaced_sessions"] = np.maximum(required - sessions, 0).sum(axis=1)
+
+    # Load variance over each section's teaching days, averaged over sections
+    loads = assigned.sum(axis=3)                                      # [B, N, D]
+    active = (valid & ~brk).any(axis=3)
+    n_active = np.maximum(active.sum(axis=2), 1)
+    mean = (loads * active).sum(axis=2) / n_active
+    variance = (((loads - mean[..., None]) ** 2) * active).sum(axis=2) / n_active
+    metrics["daily_load_variance"] = variance.mean(axis=1)
+
+    # Teacher idle gaps: free, non-break slots between a teacher's first and last class of a day
+    teachers = len(enc.vocab.teachers)
+    metrics["teacher_clashes"] = clashes(t, teachers)
+    if teachers:
+        occ = np.moveaxis((t[..., None] == np.arange(teachers)).any(axis=1), 3, 1)   # [B, T, D, S]
+        has = occ.any(axis=-1)
+        first = np.where(has, occ.argmax(axis=-1), slots)
+        last = np.where(has, slots - 1 - occ[..., ::-1].argmax(axis=-1), -1)
+        inside = (idx >= first[..., None]) & (idx <= last[..., None])
+        teachable = (valid & ~brk).any(axis=1)[:, None]               # [B, 1, D, S]
+        metrics["teacher_idle_gaps"] = (inside & ~occ & teachable).sum(axis=(1, 2, 3))
+    else:
+        metrics["teacher_idle_gaps"] = np.zeros(t.shape[0], dtype=np.int64)
+
+    metrics["room_clashes"] = clashes(enc.room, len(enc.vocab.rooms))
+
+    # Lab sessions before vs after each day's break; a split off by more than parity is a deviation.
+    # A break can span several slots, so "before" ends at its first cell and "after" starts past its last.
+    has_break = brk.any(axis=-1)                                      # [B, N, D]
+    break_first = np.where(has_break, brk.argmax(axis=-1), -1)[..., None]
+    break_last = np.where(has_break, slots - 1 - brk[..., ::-1].argmax(axis=-1), -1)[..., None]
+    lab_starts = starts & lab
+    before = (lab_starts & (idx < break_first)).sum(axis=-1)
+    after = (lab_starts & (idx > break_last)).sum(axis=-1)
+    deviation = np.where(has_break, np.abs(before - after) - (before + after) % 2, 0)
+    metrics["labs_before_break"] = np.where(has_break, before, 0).sum(axis=(1, 2))
+    metrics["labs_after_break"] = np.where(has_break, after, 0).sum(axis=(1, 2))
+    metrics["lab_split_deviation"] = deviation.sum(axis=(1, 2))
+
+    # Labs in the first slot after the break
+    after_break = (idx == break_last + 1) & has_break[..., None]
+    metrics["labs_first_after_break"] = (after_break & assigned & lab).sum(axis=(1, 2, 3))
+    return metrics
+
+
+def quality_score(metrics, weights=DEFAULT_WEIGHTS):
+    """Weighted sum of the metrics present, per batch item; lower is better."""
+    score = 0.0
+    for name, weight in weights.items():
+        if name in metrics:
+            score = score + weight * metrics[name]
+    return score
+
+
+def evaluate(grids, required_sessions=None, weights=DEFAULT_WEIGHTS):
+    """Metrics for one set of section grids as plain Python numbers (JSON-serialisable)."""
+    metrics = evaluate_encoded(encode_grids(grids), required_sessions)
+    metrics["score"] = quality_score(metrics, weights)
+    return {name: np.asarray(value)[0].item() for name, value in metrics.items()}
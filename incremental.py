@@ -0,0 +1,191 @@
+from routine_grid import place_courses, hours_to_slots
+from room_allocator import grid_sessions
+
+# Upper bound on sessions the local repair may move for one reschedule
+MAX_REPAIR_MOVES = 10
+
+
+def session_length(session_time, slot_minutes):
+    try:
+        return hours_to_slots(int(session_time.split()[0]), slot_minutes)
+    except Exception:
+        return 0
+
+
+def wanted_sessions(course_list, slot_minutes):
+    """(teacher, code, is_lab) -> [session_time, length, per_week] for the current course table.
+
+    Rows repeating a (teacher, code, is_lab) with the same session length are
+    merged; one with a different length can't share the key's placements, so
+    it is returned in `conflicts` as a (teacher, code, per_week, is_lab) row
+    instead of replacing the first. Returns (wanted, conflicts).
+    """
+    wanted = {}
+    conflicts = []
+    for teacher, code, session_time, per_week, is_lab in course_list:
+        length = session_length(session_time, slot_minutes)
+        if length <= 0:
+            continue
+        key = (teacher, code, bool(is_lab))
+        if key not in wanted:
+            wanted[key] = [session_time, length, per_week]
+        elif wanted[key][1] == length:
+            wanted[key][2] += per_week
+        else:
+            conflicts.append((teacher, code, per_week, bool(is_lab)))
+    return wanted, conflicts
+
+
+def existing_sessions(grid, wanted):
+    """Split the grid's placements into sessions still wanted (per key) and runs to drop.
+
+    A contiguous run of one course is kept as run_length / length sessions; a
+    run whose length no longer divides evenly (session time changed) is dropped.
+    """
+    kept = {}
+    dropped = []
+    for run in grid_sessions(grid):
+        spec = wanted.get(run["key"])
+        if spec is None or len(run["cells"]) % spec[1] != 0:
+            dropped.append(run["cells"])
+            continue
+        length = spec[1]
+        for i in range(0, len(run["cells"]), length):
+            kept.setdefault(run["key"], []).append((run["day"], run["cells"][i:i + length]))
+    return kept, dropped
+
+
+def window_is_consecutive(window, slot_minutes):
+    return all(not c["is_break"] for c in window) and all(
+        b["start"] - a["start"] == slot_minutes for a, b in zip(window, window[1:]))
+
+
+def find_free_run(grid, teacher, is_lab, length, slot_minutes, avoid=()):
+    """(day, cells) of a free run for the session, or None."""
+    avoid_ids = {id(c) for c in avoid}
+    for day in sorted(grid.active_days(), key=grid.day_load):
+        if not is_lab and grid.has_tutorial(day, teacher):
+            continue
+        for run in grid.free_runs(day, length, slot_minutes):
+            if not any(id(c) in avoid_ids for c in run):
+                return day, run
+    return None
+
+
+def session_index(grid):
+    """day -> the day's sessions as grid_sessions() returns them; repair_one keeps it current."""
+    index = {day: [] for day in grid.days}
+    for run in grid_sessions(grid):
+        index[run["day"]].append(run)
+    return index
+
+
+def indexed_run(key, day, cells):
+    return {"key": key, "day": day, "start": cells[0]["start"], "end": cells[-1]["end"], "cells": list(cells)}
+
+
+def repair_one(grid, index, teacher, code, is_lab, length, slot_minutes):
+    """Make room for one session by moving a single blocking session elsewhere; True on success.
+
+    `index` is session_index(grid), updated here for the moves made, so each
+    repair only looks at the days it tries rather than the whole routine.
+    """
+    for day in sorted(grid.active_days(), key=grid.day_load):
+        if not is_lab and grid.has_tutorial(day, teacher):
+            continue
+        day_cells = grid.cells[day]
+        day_runs = index[day]
+        for start in range(len(day_cells) - length + 1):
+            window = day_cells[start:start + length]
+            if not window_is_consecutive(window, slot_minutes):
+                continue
+            window_ids = {id(c) for c in window}
+            blockers = [r for r in day_runs if any(id(c) in window_ids for c in r["cells"])]
+            if len(blockers) != 1:
+                continue
+            blocker = blockers[0]
+            b_teacher, b_code, b_is_lab = blocker["key"]
+            for cell in blocker["cells"]:
+                grid.free(cell)
+            found = find_free_run(grid, b_teacher, b_is_lab, len(blocker["cells"]), slot_minutes, avoid=window)
+            if found is None:
+                for cell in blocker["cells"]:
+                    grid.assign(cell, b_teacher, b_code, b_is_lab)
+                continue
+            dest_day, dest = found
+            for cell in dest:
+                grid.assign(cell, b_teacher, b_code, b_is_lab)
+            for cell in window:
+                grid.assign(cell, teacher, code, is_lab)
+            day_runs.remove(blocker)
+            index[dest_day].append(indexed_run(blocker["key"], dest_day, dest))
+            day_runs.append(indexed_run((teacher, code, is_lab), day, window))
+            return True
+    return False
+
+
+def reschedule_incremental(grid, labs, tutorials, max_moves=MAX_REPAIR_MOVES):
+    """Bring an already-scheduled grid in line with the course lists without reshuffling it.
+
+    Placements of unchanged courses stay where they are; sessions of removed
+    or re-timed courses, and surplus sessions, are freed; only the missing
+    sessions are placed. Sessions that don't fit get a bounded local repair
+    that moves one blocking session per placement. Labs are not re-balanced
+    and days are not compacted, since both would move existing classes.
+    """
+    slot_minutes = grid.slot_minutes()
+    wanted, conflicts = wanted_sessions(labs + tutorials, slot_minutes)
+    kept, dropped = existing_sessions(grid, wanted)
+
+    removed = 0
+    for cells in dropped:
+        for cell in cells:
+            grid.free(cell)
+        removed += 1
+
+    kept_count = 0
+    missing_labs, missing_tutorials = [], []
+    for key, (session_time, length, per_week) in wanted.items():
+        placed = kept.get(key, [])
+        # Drop surplus sessions from the busiest days first
+        placed.sort(key=lambda s: grid.day_load(s[0]), reverse=True)
+        while len(placed) > per_week:
+            _, cells = placed.pop(0)
+            for cell in cells:
+                grid.free(cell)
+            removed += 1
+        kept_count += len(placed)
+        if len(placed) < per_week:
+            teacher, code, is_lab = key
+            row = (teacher, code, session_time, per_week - len(placed), is_lab)
+            (missing_labs if is_lab else missing_tutorials).append(row)
+
+    missing_labs.sort(key=lambda x: (wanted[(x[0], x[1], True)][1], x[3]), reverse=True)
+    missing_tutorials.sort(key=lambda x: x[3], reverse=True)
+    added = sum(row[3] for row in missing_labs + missing_tutorials)
+
+    unplaced = place_courses(grid, missing_labs, slot_minutes, even_distribution=False)
+    unplaced += place_courses(grid, missing_tutorials, slot_minutes, even_distribution=True)
+
+    repaired = 0
+    still_unplaced = []
+    # Built once, and only when some session needs repair
+    index = session_index(grid) if unplaced and max_moves else None
+    for teacher, code, count, is_lab in unplaced:
+        length = wanted[(teacher, code, is_lab)][1]
+        while count and repaired < max_moves and repair_one(grid, index, teacher, code, is_lab, length,
+                                                            slot_minutes):
+            count -= 1
+            repaired += 1
+        if count:
+            still_unplaced.append((teacher, code, count, is_lab))
+
+    return {
+        "kept": kept_count,
+        "added": added,
+        "removed": removed,
+        "repaired": repaired,
+        # Conflicting duplicate rows are never placed; listing them makes the outcome "partial"
+        "unplaced": still_unplaced + conflicts,
+        "conflicting_rows": len(conflicts),
+    }
@@ -0,0 +1,269 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from db import get_db_connection, get_backend
+from routine_grid import load_grid, write_grid, load_course_lists
+from scheduling import schedule_grid
+from table_versions import table_version, bump_table_version
+from routine_export import load_export_items, iter_export_zip
+from teacher_index import refresh_teacher_index
+
+# Background scheduling workers per web process; placement itself runs in child processes
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+# A job whose row hasn't been touched for this long is treated as abandoned (e.g. its worker died)
+JOB_STALE_SECONDS = int(os.environ.get("JOB_STALE_SECONDS", "600"))
+# Finished routine exports are written here and served by the download route
+EXPORT_DIR = os.environ.get("EXPORT_DIR", os.path.join(tempfile.gettempdir(), "hackheritage-exports"))
+# Lock key in schedule_jobs.active_table: one export at a time across all workers
+EXPORT_JOB_KEY = "*routine-export*"
+# Insert attempts when another worker races us for a section's active slot
+JOB_CREATE_ATTEMPTS = 3
+
+logger = logging.getLogger(__name__)
+
+_job_threads = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="schedule-job")
+_cpu_pool = None
+_cpu_pool_lock = threading.Lock()
+_table_ready = False
+
+
+def get_cpu_pool():
+    global _cpu_pool
+    if _cpu_pool is None:
+        with _cpu_pool_lock:
+            if _cpu_pool is None:
+                _cpu_pool = ProcessPoolExecutor(max_workers=JOB_WORKERS)
+    return _cpu_pool
+
+
+def ensure_jobs_table(cur):
+    global _table_ready
+    if _table_ready:
+        return
+    # active_table is set only while a job is queued/running; UNIQUE makes it the de-duplication lock
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schedule_jobs (
+            id VARCHAR(32) PRIMARY KEY,
+            routine_table VARCHAR(100) NOT NULL,
+            active_table VARCHAR(100) NULL UNIQUE,
+            status VARCHAR(20) NOT NULL,
+            progress VARCHAR(100) NULL,
+            result TEXT NULL,
+            created_at DATETIME NOT NULL,
+            updated_at DATETIME NOT NULL
+        )
+    """)
+    _table_ready = True
+
+
+def update_job(cur, job_id, status, progress=None, result=None, release=False):
+    cur.execute(f"""
+        UPDATE schedule_jobs
+        SET status = %s, progress = %s, result = %s, updated_at = %s
+            {", active_table = NULL" if release else ""}
+        WHERE id = %s
+    """, (status, progress, None if result is None else json.dumps(result, default=str),
+          datetime.utcnow(), job_id))
+
+
+def active_job(cur, routine_table):
+    cur.execute("SELECT id, updated_at FROM schedule_jobs WHERE active_table = %s", (routine_table,))
+    return cur.fetchone()
+
+
+def create_job(routine_table):
+    """Insert a queued job for routine_table; returns (job_id, created).
+
+    If a job for the same routine table is already queued or running (in any
+    web worker) that job's id is returned instead of starting a second one.
+    Returns (None, False) if the active slot kept changing hands while we
+    tried to take it.
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+    ensure_jobs_table(cur)
+    try:
+        for _ in range(JOB_CREATE_ATTEMPTS):
+            existing = active_job(cur, routine_table)
+            if existing and datetime.utcnow() - existing[1] > timedelta(seconds=JOB_STALE_SECONDS):
+                update_job(cur, existing[0], "failed", result={"error": "abandoned"}, release=True)
+                conn.commit()
+                existing = None
+            if existing:
+                return existing[0], False
+
+            job_id = uuid.uuid4().hex
+            now = datetime.utcnow()
+            try:
+                cur.execute("""
+                    INSERT INTO schedule_jobs (id, routine_table, active_table, status, progress, created_at, updated_at)
+                    VALUES (%s, %s, %s, 'queued', NULL, %s, %s)
+                """, (job_id, routine_table, routine_table, now, now))
+                conn.commit()
+                return job_id, True
+            except get_backend().IntegrityError:
+                # Another worker queued (and maybe already finished) a job between our check and insert
+                conn.rollback()
+        logger.warning("Could not queue a job for %s after %d attempts", routine_table, JOB_CREATE_ATTEMPTS)
+        return None, False
+    finally:
+        cur.close()
+        conn.close()
+
+
+def submit_schedule_job(routine_table, courses_table, engine="random", seed=0, time_limit=5.0):
+    """Queue a scheduling run for a section; returns (job_id, created)."""
+    job_id, created = create_job(routine_table)
+    if created:
+        _job_threads.submit(run_schedule_job, job_id, routine_table, courses_table, engine, seed, time_limit)
+    return job_id, created
+
+
+def run_schedule_job(job_id, routine_table, courses_table, engine, seed, time_limit):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        update_job(cur, job_id, "running", progress="loading")
+        conn.commit()
+
+        version = table_version(routine_table)
+        grid = load_grid(cur, routine_table)
+        labs, tutorials = load_course_lists(cur, courses_table, grid.slot_minutes())
+
+        update_job(cur, job_id, "running", progress="placing")
+        conn.commit()
+        if engine == "multistart":
+            # Fans out to its own process pool; this thread only waits for the results
+            grid, outcome = run_placement(grid, labs, tutorials, engine, seed, time_limit)
+        else:
+            future = get_cpu_pool().submit(run_placement, grid, labs, tutorials, engine, seed, time_limit)
+            grid, outcome = future.result()
+
+        if not outcome.writable:
+            update_job(cur, job_id, "failed", result=dict(outcome.report, status=outcome.status), release=True)
+            conn.commit()
+            return
+
+        if table_version(routine_table) != version:
+            update_job(cur, job_id, "failed", release=True,
+                       result={"error": "routine table changed while scheduling; submit again"})
+            conn.commit()
+            return
+
+        # Publish the grid and finish the job in the same transaction
+        update_job(cur, job_id, "done", progress="published",
+                   result=dict(outcome.report, status=outcome.status), release=True)
+        write_grid(cur, routine_table, grid)
+        conn.commit()
+        bump_table_version(routine_table)
+        refresh_teacher_index(conn, routine_table)
+    except Exception as e:
+        logger.exception("Schedule job %s failed", job_id)
+        mark_failed(conn, cur, job_id, e)
+    finally:
+        cur.close()
+        conn.close()
+
+
+def mark_failed(conn, cur, job_id, error):
+    """Record a job as failed and release its active slot.
+
+    The job's own connection may be what broke, so fall back to a fresh one;
+    if that fails too the row is left for the stale-job check to release.
+    """
+    try:
+        conn.rollback()
+        update_job(cur, job_id, "failed", result={"error": str(error)}, release=True)
+        conn.commit()
+        return
+    except Exception:
+        logger.exception("Could not record failure of job %s; retrying on a new connection", job_id)
+    try:
+        fresh = get_db_connection()
+        fresh_cur = fresh.cursor()
+        try:
+            update_job(fresh_cur, job_id, "failed", result={"error": str(error)}, release=True)
+            fresh.commit()
+        finally:
+            fresh_cur.close()
+            fresh.close()
+    except Exception:
+        logger.exception("Job %s is still marked active; it is released after %ds", job_id, JOB_STALE_SECONDS)
+
+
+def run_placement(grid, labs, tutorials, engine, seed, time_limit):
+    outcome = schedule_grid(grid, labs, tutorials, engine=engine, seed=seed, time_limit=time_limit)
+    return grid, outcome
+
+
+def submit_export_job(sections=True, teachers=True):
+    """Queue a ZIP export of every section and/or teacher timetable; returns (job_id, created)."""
+    job_id, created = create_job(EXPORT_JOB_KEY)
+    if created:
+        _job_threads.submit(run_export_job, job_id, sections, teachers)
+    return job_id, created
+
+
+def export_path(job_id):
+    return os.path.join(EXPORT_DIR, f"{job_id}.zip")
+
+
+def run_export_job(job_id, sections, teachers):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        update_job(cur, job_id, "running", progress="loading")
+        conn.commit()
+        items = load_export_items(cur, sections=sections, teachers=teachers)
+
+        def progress(done, total):
+            # Keep the row fresh so a long export isn't mistaken for an abandoned one
+            update_job(cur, job_id, "running", progress=f"rendered {done}/{total}")
+            conn.commit()
+
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        path = export_path(job_id)
+        with open(path + ".part", "wb") as f:
+            for chunk in iter_export_zip(items, progress=progress):
+                f.write(chunk)
+        os.replace(path + ".part", path)
+
+        update_job(cur, job_id, "done", progress=f"rendered {len(items)}/{len(items)}",
+                   result={"files": len(items), "bytes": os.path.getsize(path)}, release=True)
+        conn.commit()
+    except Exception as e:
+        logger.exception("Export job %s failed", job_id)
+        mark_failed(conn, cur, job_id, e)
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_job(job_id):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    ensure_jobs_table(cur)
+    cur.execute("""
+        SELECT id, routine_table, status, progress, result, created_at, updated_at
+        FROM schedule_jobs
+        WHERE id = %s
+    """, (job_id,))
+    row = cur.fetchone()
+    cur.close()
+    conn.close()
+    if row is None:
+        return None
+    return {
+        "job_id": row[0],
+        "routine_table": row[1],
+        "status": row[2],
+        "progress": row[3],
+        "result": json.loads(row[4]) if row[4] else None,
+        "created_at": row[5].isoformat() if row[5] else None,
+        "updated_at": row[6].isoformat() if row[6] else None,
+    }
@@ -0,0 +1,41 @@
+"""Copy every per-section `{prefix}_courses` / `{prefix}_routine` pair into the normalised schema.
+
+Safe to re-run: each section's rows are replaced, one transaction per section.
+
+    python migrate_schema.py              # every section
+    python migrate_schema.py cse_3_2025   # selected table prefixes
+"""
+import sys
+from db import get_db_connection, get_backend
+from batch_scheduler import discover_sections
+from schema import ensure_schema, ensure_section, sync_section_courses, sync_section_routine
+
+
+def migrate(prefixes=None):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    ensure_schema(cur, get_backend())
+    conn.commit()
+
+    summary = []
+    for prefix in discover_sections(cur):
+        if prefixes and prefix not in prefixes:
+            continue
+        try:
+            section_id = ensure_section(cur, prefix)
+            sync_section_courses(cur, section_id, f"{prefix}_courses")
+            sync_section_routine(cur, section_id, f"{prefix}_routine")
+            conn.commit()
+            summary.append((prefix, "ok"))
+        except Exception as e:
+            conn.rollback()
+            summary.append((prefix, f"failed: {e}"))
+
+    cur.close()
+    conn.close()
+    return summary
+
+
+if __name__ == "__main__":
+    for prefix, status in migrate(sys.argv[1:] or None):
+        print(f"{prefix}: {status}")
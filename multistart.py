@@ -0,0 +1,85 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# Independent placement attempts per run and the processes they share
+MULTISTART_ATTEMPTS = int(os.environ.get("MULTISTART_ATTEMPTS", "16"))
+MULTISTART_WORKERS = int(os.environ.get("MULTISTART_WORKERS", str(os.cpu_count() or 1)))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_multistart_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=MULTISTART_WORKERS)
+    return _pool
+
+
+def score_grid(grid, unplaced_sessions):
+    """Quality of a placed grid; lower is better on every component, compared in this order.
+
+    teacher_clustering is the sum over teachers of squared slots-per-day, which
+    is smallest when each teacher's load is spread evenly across the week.
+    """
+    teacher_day = {}
+    for day in grid.days:
+        for cell in grid.cells[day]:
+            if cell["teacher"] is not None and not cell["is_break"]:
+                key = (cell["teacher"], day)
+                teacher_day[key] = teacher_day.get(key, 0) + 1
+    loads = [grid.day_load(day) for day in grid.active_days()]
+    return {
+        "unplaced": unplaced_sessions,
+        "teacher_clustering": sum(n * n for n in teacher_day.values()),
+        "day_imbalance": max(loads) - min(loads) if loads else 0,
+    }
+
+
+def score_key(score):
+    return score["unplaced"], score["teacher_clustering"], score["day_imbalance"]
+
+
+def run_attempt(grid, labs, tutorials, seed):
+    """One seeded random placement on the worker's own copy of the grid."""
+    from scheduling import schedule_grid
+    random.seed(seed)
+    outcome = schedule_grid(grid, labs, tutorials, engine="random")
+    unplaced = sum(u["sessions"] for u in outcome.report["unplaced"])
+    return seed, score_grid(grid, unplaced), grid, outcome
+
+
+def best_of(grid, labs, tutorials, attempts=MULTISTART_ATTEMPTS, seed=0, time_limit=5.0):
+    """Run `attempts` seeded placements in parallel and copy the best-scoring one into `grid`.
+
+    Attempts still queued when time_limit runs out are cancelled; ones already
+    running can't be stopped and are left to finish in the pool, unused. The
+    best finished one wins (the first result is always waited for). Returns
+    (outcome, report extras).
+    """
+    deadline = time.monotonic() + time_limit
+    pool = get_multistart_pool()
+    pending = {pool.submit(run_attempt, grid, labs, tutorials, seed + i) for i in range(max(1, attempts))}
+    results = []
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 and results:
+            break
+        done, pending = wait(pending, timeout=max(remaining, 0) if results else None, return_when=FIRST_COMPLETED)
+        results.extend(f.result() for f in done)
+    cancelled = sum(1 for future in pending if future.cancel())
+
+    best_seed, best_score, best_grid, outcome = min(results, key=lambda r: score_key(r[1]))
+    grid.adopt(best_grid)
+    return outcome, {
+        "attempts": len(results),
+        "cancelled": cancelled,
+        "abandoned_running": len(pending) - cancelled,
+        "best_seed": best_seed,
+        "score": best_score,
+    }
@@ -0,0 +1,84 @@
+import os
+import sys
+import threading
+import time
+from render_cache import LRUCache
+from table_versions import table_version, on_table_bump
+
+QUERY_CACHE_TTL = float(os.environ.get("QUERY_CACHE_TTL", "300"))
+QUERY_CACHE_MAX_BYTES = int(os.environ.get("QUERY_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+QUERY_CACHE_MAX_ENTRIES = int(os.environ.get("QUERY_CACHE_MAX_ENTRIES", "1024"))
+
+
+def rows_size(rows):
+    """Rough in-memory size of a fetchall() result."""
+    return sys.getsizeof(rows) + sum(sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row) for row in rows)
+
+
+class QueryCache:
+    """Read-through cache of SELECT results, keyed by (table, table version, sql, params).
+
+    A write bumps the table's version, so other workers stop using old rows
+    at once and this worker drops them too; the TTL bounds staleness for
+    writes made outside the app.
+    """
+
+    def __init__(self, ttl=QUERY_CACHE_TTL, max_bytes=QUERY_CACHE_MAX_BYTES, max_entries=QUERY_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        # Values are (expires_at, size, rows)
+        self._lru = LRUCache(max_bytes, max_entries, sizeof=lambda value: value[1])
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidations = 0
+
+    def lookup(self, table, sql, params=()):
+        """(key, rows) with rows None on a miss; read the version before querying so a write can't go stale."""
+        key = (table, table_version(table), sql, tuple(params))
+        entry = self._lru.get(key)
+        with self._lock:
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return key, entry[2]
+            if entry is not None:
+                self.expired += 1
+            self.misses += 1
+        return key, None
+
+    def store(self, key, rows):
+        self._lru.put(key, (time.monotonic() + self.ttl, rows_size(rows), rows))
+
+    def fetch(self, cur, table, sql, params=()):
+        """Rows of a query on `table`, from cache or by running it on `cur`."""
+        key, rows = self.lookup(table, sql, params)
+        if rows is None:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+            self.store(key, rows)
+        return rows
+
+    def invalidate(self, table):
+        dropped = self._lru.discard_matching(lambda key: key[0] == table)
+        with self._lock:
+            self.invalidations += dropped
+
+    def stats(self):
+        lru = self._lru.stats()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "invalidations": self.invalidations,
+                "evictions": lru["evictions"],
+                "entries": lru["entries"],
+                "bytes": lru["bytes"],
+                "max_bytes": lru["max_bytes"],
+                "max_entries": lru["max_entries"],
+                "ttl_seconds": self.ttl,
+            }
+
+
+query_cache = QueryCache()
+on_table_bump(query_cache.invalidate)
@@ -0,0 +1,75 @@
+import os
+import threading
+from collections import OrderedDict
+
+RENDER_CACHE_MAX_BYTES = int(os.environ.get("RENDER_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RENDER_CACHE_MAX_ENTRIES = int(os.environ.get("RENDER_CACHE_MAX_ENTRIES", "256"))
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and total value size in bytes (sizeof(value))."""
+
+    def __init__(self, max_bytes=RENDER_CACHE_MAX_BYTES, max_entries=RENDER_CACHE_MAX_ENTRIES, sizeof=len):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.sizeof = sizeof
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self.sizeof(self._data.pop(key))
+            self._data[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._data) > self.max_entries:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= self.sizeof(evicted)
+                self.evictions += 1
+
+    def discard_matching(self, predicate):
+        """Drop every entry whose key satisfies predicate; returns how many were dropped."""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                self._bytes -= self.sizeof(self._data.pop(key))
+            return len(keys)
+
+    def get_or_render(self, key, render):
+        value = self.get(key)
+        if value is None:
+            value = render()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+            }
+
+
+# Rendered routine HTML pages and PDF bytes, keyed by (kind, routine table, table version, ...)
+render_cache = LRUCache()
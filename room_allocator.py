@@ -0,0 +1,105 @@
+from bisect import bisect_left
+from routine_grid import time_to_minutes, minutes_label
+
+
+class RoomOccupancy:
+    """Per-(room, day) sorted lists of disjoint intervals used to keep rooms from being double-booked.
+
+    Overlapping or touching intervals are merged on add (stored rows can overlap),
+    so is_free only has to look at the neighbours of the insertion point.
+    """
+
+    def __init__(self):
+        self._intervals = {}
+
+    def is_free(self, room, day, start, end):
+        intervals = self._intervals.get((room, day), [])
+        i = bisect_left(intervals, (start, end))
+        if i > 0 and intervals[i - 1][1] > start:
+            return False
+        if i < len(intervals) and intervals[i][0] < end:
+            return False
+        return True
+
+    def add(self, room, day, start, end):
+        intervals = self._intervals.setdefault((room, day), [])
+        i = bisect_left(intervals, (start, end))
+        if i > 0 and intervals[i - 1][1] >= start:
+            i -= 1
+            start = intervals[i][0]
+            end = max(end, intervals[i][1])
+        j = i
+        while j < len(intervals) and intervals[j][0] <= end:
+            end = max(end, intervals[j][1])
+            j += 1
+        intervals[i:j] = [(start, end)]
+
+
+def load_room_occupancy(cur, exclude_table):
+    """Room usage of every other routine table, so sections don't take each other's rooms."""
+    occupancy = RoomOccupancy()
+    cur.execute("SHOW TABLES")
+    tables = [row[0] for row in cur.fetchall() if row[0].endswith("_routine") and row[0] != exclude_table]
+    for table in tables:
+        cur.execute(f"""
+            SELECT day, slot_start, slot_end, classroom
+            FROM {table}
+            WHERE classroom IS NOT NULL AND teacher_name IS NOT NULL
+        """)
+        for day, slot_start, slot_end, classroom in cur.fetchall():
+            occupancy.add(classroom, day, time_to_minutes(slot_start), time_to_minutes(slot_end))
+    return occupancy
+
+
+def grid_sessions(grid):
+    """Contiguous runs of cells with the same teacher/course on a day, as one session each."""
+    sessions = []
+    for day in grid.days:
+        current = None
+        for cell in grid.cells[day]:
+            key = (cell["teacher"], cell["code"], cell["is_lab"])
+            if cell["teacher"] is None or cell["is_break"]:
+                current = None
+                continue
+            if current and current["key"] == key and current["end"] == cell["start"]:
+                current["cells"].append(cell)
+                current["end"] = cell["end"]
+            else:
+                current = {"key": key, "day": day, "start": cell["start"], "end": cell["end"], "cells": [cell]}
+                sessions.append(current)
+    return sessions
+
+
+def allocate_rooms(grid, tutorial_rooms, lab_rooms, occupancy):
+    """Give every session in the grid a room that is free for its whole interval.
+
+    Sessions are taken in start-time order per day (interval partitioning) and
+    get the first listed room that is free in the shared occupancy index, so a
+    room is never double-booked across sections. Returns the sessions that
+    could not get a room.
+    """
+    unassigned = []
+    sessions = sorted(grid_sessions(grid), key=lambda s: (grid.days.index(s["day"]), s["start"], s["end"]))
+    for session in sessions:
+        is_lab = session["key"][2]
+        rooms = lab_rooms if is_lab else tutorial_rooms
+        room = next((r for r in rooms if occupancy.is_free(r, session["day"], session["start"], session["end"])), None)
+        for cell in session["cells"]:
+            cell["classroom"] = room
+        if room is None:
+            unassigned.append(session)
+        else:
+            occupancy.add(room, session["day"], session["start"], session["end"])
+    return unassigned
+
+
+def shortage_report(unassigned):
+    lines = []
+    for session in unassigned:
+        teacher, code, is_lab = session["key"]
+        kind = "lab" if is_lab else "tutorial"
+        lines.append(
+            f"{session['day']} {minutes_label(session['start'])}-{minutes_label(session['end'])} "
+            f"{teacher} {code} ({kind})"
+        )
+    return lines
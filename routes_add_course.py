@@ -1,5 +1,6 @@
 from flask import render_template, request, redirect, url_for, session
 from db import get_db_connection
+from table_versions import bump_table_version
 
 def init_add_course_routes(app):
     @app.route("/add", methods=["GET", "POST"])
@@ -31,6 +32,7 @@ def init_add_course_routes(app):
             conn.commit()
             cur.close()
             conn.close()
+            bump_table_version(courses_table)
 
             if "next" in request.form:
                 return redirect(url_for("add_course"))
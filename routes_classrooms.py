@@ -1,77 +1,12 @@
 from flask import render_template, request, redirect, url_for, session
 from db import get_db_connection
-import random
+from routine_grid import load_grid, write_grid
+from room_allocator import load_room_occupancy, allocate_rooms, shortage_report
+from table_versions import bump_table_version
+from teacher_index import refresh_teacher_index
 
 def init_classroom_routes(app):
 
-    def assign_classrooms_for_multi_sessions(cur, routine_table, tutorial_rooms, lab_rooms):
-        """Assign classrooms for multi-slot sessions."""
-
-        # MySQL-compatible query (removed PostgreSQL-specific parts and ORDER BY RAND())
-        cur.execute(f"""
-            SELECT 
-                day, 
-                teacher_name, 
-                course_code, 
-                is_lab,
-                MIN(slot_start) AS start_time, 
-                MAX(slot_end) AS end_time,
-                COUNT(*) AS session_count
-            FROM {routine_table}
-            WHERE teacher_name IS NOT NULL
-            GROUP BY day, teacher_name, course_code, is_lab
-            HAVING COUNT(*) > 1
-        """)
-        multi_sessions = cur.fetchall()
-
-        # Shuffle results in Python instead of using RAND()
-        random.shuffle(multi_sessions)
-
-        for day, teacher, code, is_lab, start, end, count in multi_sessions:
-            rooms = lab_rooms if is_lab else tutorial_rooms
-            room = random.choice(rooms)
-
-            # Use equality for slot boundaries (>= and <= can skip if multiple sessions overlap)
-            cur.execute(f"""
-                UPDATE {routine_table}
-                SET classroom = %s
-                WHERE day = %s
-                  AND slot_start >= %s
-                  AND slot_end <= %s
-                  AND teacher_name = %s
-                  AND course_code = %s
-            """, (room, day, start, end, teacher, code))
-
-    def assign_classrooms_for_single_sessions(cur, routine_table, tutorial_rooms, lab_rooms):
-        """Assign classrooms for single-slot sessions."""
-
-        # MySQL version (removed PostgreSQL-only syntax)
-        cur.execute(f"""
-            SELECT day, slot_start, slot_end, teacher_name, course_code, is_lab
-            FROM {routine_table}
-            WHERE teacher_name IS NOT NULL
-              AND time_slot <> 'BREAK'
-              AND classroom IS NULL
-        """)
-        single_sessions = cur.fetchall()
-
-        # Shuffle to randomize instead of ORDER BY RAND()
-        random.shuffle(single_sessions)
-
-        for i, (day, start, end, teacher, code, is_lab) in enumerate(single_sessions):
-            rooms = lab_rooms if is_lab else tutorial_rooms
-            room = rooms[i % len(rooms)]
-
-            cur.execute(f"""
-                UPDATE {routine_table}
-                SET classroom = %s
-                WHERE day = %s
-                  AND slot_start = %s
-                  AND slot_end = %s
-                  AND teacher_name = %s
-                  AND course_code = %s
-            """, (room, day, start, end, teacher, code))
-
     @app.route("/classroom-assignment", methods=["GET", "POST"])
     def classroom_assignment():
         if "routine_table" not in session:
@@ -92,22 +27,29 @@ def init_classroom_routes(app):
             cur = conn.cursor()
             routine_table = session["routine_table"]
 
-            # Clear any existing classroom assignments
-            cur.execute(f"""
-                UPDATE {routine_table}
-                SET classroom = NULL
-                WHERE teacher_name IS NOT NULL
-            """)
+            # Rooms already taken by other sections' routines
+            occupancy = load_room_occupancy(cur, routine_table)
 
-            # Assign classrooms to multi-slot sessions first
-            assign_classrooms_for_multi_sessions(cur, routine_table, tutorial_rooms, lab_rooms)
+            # Clear any existing classroom assignments, then allocate without double-booking
+            grid = load_grid(cur, routine_table)
+            for day in grid.days:
+                for cell in grid.cells[day]:
+                    cell["classroom"] = None
+            unassigned = allocate_rooms(grid, tutorial_rooms, lab_rooms, occupancy)
 
-            # Then assign to single-slot sessions
-            assign_classrooms_for_single_sessions(cur, routine_table, tutorial_rooms, lab_rooms)
+            write_grid(cur, routine_table, grid)
 
             conn.commit()
             cur.close()
+            refresh_teacher_index(conn, routine_table)
             conn.close()
+            bump_table_version(routine_table)
+
+            if unassigned:
+                return render_template(
+                    "classroom_assignment.html",
+                    error="Not enough free classrooms for: " + "; ".join(shortage_report(unassigned))
+                )
 
             return redirect(url_for("view_routine"))
 
@@ -0,0 +1,55 @@
+import os
+from flask import Response, jsonify, request, send_file, stream_with_context, url_for
+from db import get_db_connection
+from jobs import submit_export_job, get_job, export_path, EXPORT_JOB_KEY
+from routine_export import load_export_items, iter_export_zip
+
+def export_flags():
+    which = request.values.get("include", "sections,teachers").split(",")
+    return "sections" in which, "teachers" in which
+
+def init_export_routes(app):
+    @app.route("/export/routines.zip")
+    def export_routines_zip():
+        """Every section and teacher timetable as PDFs in a ZIP, streamed as each one is rendered."""
+        sections, teachers = export_flags()
+        conn = get_db_connection()
+        cur = conn.cursor()
+        items = load_export_items(cur, sections=sections, teachers=teachers)
+        cur.close()
+        conn.close()
+
+        return Response(
+            stream_with_context(iter_export_zip(items)),
+            mimetype="application/zip",
+            headers={"Content-Disposition": "attachment;filename=routines.zip"}
+        )
+
+    @app.route("/export/routines/jobs", methods=["POST"])
+    def submit_export_routines_job():
+        """Build the export ZIP in the background; the status URL reports rendered/total."""
+        sections, teachers = export_flags()
+        job_id, created = submit_export_job(sections=sections, teachers=teachers)
+        if job_id is None:
+            return jsonify(error="another export is starting; try again"), 409
+        status_url = url_for("export_routines_job_status", job_id=job_id)
+        return jsonify(job_id=job_id, created=created, status_url=status_url), 202 if created else 200
+
+    @app.route("/export/routines/jobs/<job_id>")
+    def export_routines_job_status(job_id):
+        job = get_job(job_id)
+        if job is None or job["routine_table"] != EXPORT_JOB_KEY:
+            return jsonify(error="unknown job"), 404
+        if job["status"] == "done":
+            job["download_url"] = url_for("export_routines_job_download", job_id=job_id)
+        return jsonify(job)
+
+    @app.route("/export/routines/jobs/<job_id>/download")
+    def export_routines_job_download(job_id):
+        job = get_job(job_id)
+        if job is None or job["routine_table"] != EXPORT_JOB_KEY or job["status"] != "done":
+            return jsonify(error="export not ready"), 404
+        if not os.path.exists(export_path(job_id)):
+            return jsonify(error="export file missing"), 410
+        return send_file(export_path(job_id), mimetype="application/zip",
+                         as_attachment=True, download_name="routines.zip")
@@ -0,0 +1,185 @@
+from flask import request, redirect, url_for, session, jsonify
+import csv
+import io
+import json
+import re
+from db import get_db_connection, get_backend
+from table_versions import bump_table_version
+
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 200
+COURSE_FIELDS = ("teacher_name", "course_name", "course_code", "tutorial_time", "lab_time",
+                 "tutorials_per_week", "labs_per_week")
+SESSION_TIME_RE = re.compile(r"^\d+(\s+\w+)?$")
+# Column sizes of the courses table (see routes_select); longer values fail under MySQL strict mode
+COURSE_FIELD_LENGTHS = {"teacher_name": 100, "course_name": 100, "course_code": 50,
+                        "tutorial_time": 20, "lab_time": 20}
+MAX_SESSIONS_PER_WEEK = 2 ** 31 - 1
+
+
+def iter_csv_rows(stream):
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    for row in reader:
+        yield row
+
+
+def iter_json_rows(stream, chunk_size=64 * 1024):
+    """Yield objects from a top-level JSON array or from JSON Lines without loading the whole file."""
+    decoder = json.JSONDecoder()
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig")
+    buffer = ""
+    eof = False
+    while True:
+        buffer = buffer.lstrip(" \t\r\n,[]")
+        if not buffer:
+            if eof:
+                return
+            chunk = text.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        try:
+            obj, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = text.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield obj
+        buffer = buffer[end:]
+
+
+def validate_course(row):
+    """Return the INSERT tuple for a course row, or raise ValueError describing the first problem."""
+    if not isinstance(row, dict):
+        raise ValueError("row is not an object")
+    values = {}
+    for field in ("teacher_name", "course_name", "course_code"):
+        value = str(row.get(field) or "").strip()
+        if not value:
+            raise ValueError(f"{field} is required")
+        values[field] = value
+    for field in ("tutorial_time", "lab_time"):
+        value = str(row.get(field) or "").strip() or None
+        if value is not None and not SESSION_TIME_RE.match(value):
+            raise ValueError(f"{field} must look like '2 hours', got {value!r}")
+        values[field] = value
+    for field, time_field in (("tutorials_per_week", "tutorial_time"), ("labs_per_week", "lab_time")):
+        raw = row.get(field)
+        try:
+            count = int(raw) if raw not in (None, "") else 0
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} must be a whole number, got {raw!r}")
+        if count < 0:
+            raise ValueError(f"{field} cannot be negative")
+        if count > MAX_SESSIONS_PER_WEEK:
+            raise ValueError(f"{field} is too large")
+        if count and values[time_field] is None:
+            raise ValueError(f"{field} is {count} but {time_field} is empty")
+        values[field] = count
+    for field, limit in COURSE_FIELD_LENGTHS.items():
+        if values[field] is not None and len(values[field]) > limit:
+            raise ValueError(f"{field} is longer than {limit} characters")
+    return tuple(values[f] for f in COURSE_FIELDS)
+
+
+def insert_chunk(cur, insert_sql, chunk):
+    """Insert (row_number, values) pairs; returns (inserted, [(row_number, error), ...]).
+
+    The chunk goes in as one executemany. If the database rejects it, the
+    chunk is rolled back to a savepoint and retried row by row so only the
+    offending rows are lost.
+    """
+    Error = get_backend().Error
+    cur.execute("SAVEPOINT import_chunk")
+    try:
+        cur.executemany(insert_sql, [values for _, values in chunk])
+        cur.execute("RELEASE SAVEPOINT import_chunk")
+        return len(chunk), []
+    except Error:
+        cur.execute("ROLLBACK TO SAVEPOINT import_chunk")
+        cur.execute("RELEASE SAVEPOINT import_chunk")
+
+    inserted = 0
+    failures = []
+    for row_number, values in chunk:
+        try:
+            cur.execute(insert_sql, values)
+            inserted += 1
+        except Error as e:
+            failures.append((row_number, f"rejected by the database: {e}"))
+    return inserted, failures
+
+
+def init_import_courses_routes(app):
+    @app.route("/import-courses", methods=["POST"])
+    def import_courses():
+        """Bulk-insert courses from an uploaded CSV or JSON/JSON Lines file into the session's courses table."""
+        if "branch" not in session:
+            return redirect(url_for("select_details"))
+
+        upload = request.files.get("file")
+        if upload is None:
+            return jsonify(error="upload a CSV or JSON file in the 'file' field"), 400
+
+        courses_table = session["courses_table"]
+        is_json = upload.filename.lower().endswith((".json", ".jsonl", ".ndjson")) or \
+            (upload.mimetype or "").endswith("json")
+        rows = iter_json_rows(upload.stream) if is_json else iter_csv_rows(upload.stream)
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+        insert_sql = f"""
+            INSERT INTO {courses_table}
+            (teacher_name, course_name, course_code, tutorial_time, lab_time, tutorials_per_week, labs_per_week)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """
+
+        batch = []
+        inserted = 0
+        errors = []
+        error_count = 0
+        row_number = 0
+
+        def reject(number, message):
+            nonlocal error_count
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"row": number, "error": message})
+
+        def flush():
+            nonlocal inserted
+            done, failures = insert_chunk(cur, insert_sql, batch)
+            inserted += done
+            for number, message in failures:
+                reject(number, message)
+            batch.clear()
+
+        try:
+            for row_number, row in enumerate(rows, start=1):
+                try:
+                    batch.append((row_number, validate_course(row)))
+                except ValueError as e:
+                    reject(row_number, str(e))
+                    continue
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    flush()
+            if batch:
+                flush()
+        except (ValueError, csv.Error, UnicodeDecodeError) as e:
+            # The file itself is unreadable past this point; nothing from it is kept
+            conn.rollback()
+            cur.close()
+            conn.close()
+            return jsonify(error=f"could not parse file after row {row_number}: {e}"), 400
+
+        conn.commit()
+        cur.close()
+        conn.close()
+        bump_table_version(courses_table)
+
+        # Rows a chunk retry rejected are reported after later validation errors; restore file order
+        errors.sort(key=lambda e: e["row"])
+        return jsonify(rows=row_number, inserted=inserted, rejected=error_count, errors=errors)
@@ -0,0 +1,36 @@
+from flask import jsonify, request, session, redirect, url_for
+from db import get_db_connection
+from routine_grid import load_grid, load_course_lists
+from batch_scheduler import discover_sections
+from evaluator import evaluate
+
+def load_sections(cur, prefixes):
+    grids, required = [], []
+    for prefix in prefixes:
+        grid = load_grid(cur, f"{prefix}_routine")
+        labs, tutorials = load_course_lists(cur, f"{prefix}_courses", grid.slot_minutes())
+        grids.append(grid)
+        required.append(sum(row[3] for row in labs + tutorials))
+    return grids, required
+
+def init_quality_routes(app):
+    @app.route("/routine-quality")
+    def routine_quality():
+        """Quality metrics for the current section, or for every section with ?scope=all (adds cross-section clashes)."""
+        conn = get_db_connection()
+        cur = conn.cursor()
+        if request.args.get("scope") == "all":
+            prefixes = discover_sections(cur)
+        elif "routine_table" in session:
+            prefixes = [session["routine_table"][:-len("_routine")]]
+        else:
+            cur.close()
+            conn.close()
+            return redirect(url_for("select_details"))
+
+        grids, required = load_sections(cur, prefixes)
+        cur.close()
+        conn.close()
+        if not grids:
+            return jsonify(sections=[], metrics=None)
+        return jsonify(sections=prefixes, metrics=evaluate(grids, required))
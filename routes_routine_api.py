@@ -0,0 +1,91 @@
+import gzip
+import json
+import re
+from flask import request, jsonify, make_response
+from db import get_db_connection, get_backend
+from routine_view import load_routine_view, COLUMNAR_FIELDS
+from routes_view_routine import etag_for, is_not_modified
+from table_versions import table_version, table_modified_at
+
+# Responses smaller than this aren't worth gzipping
+GZIP_MIN_BYTES = 512
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+
+def wants_msgpack():
+    if request.args.get("format") in ("msgpack", "json"):
+        return request.args["format"] == "msgpack"
+    best = request.accept_mimetypes.best_match(("application/json",) + MSGPACK_TYPES)
+    return best in MSGPACK_TYPES
+
+def csv_arg(name, allowed):
+    if name not in request.args:
+        return list(allowed)
+    values = [v.strip() for v in request.args[name].split(",") if v.strip()]
+    return [v for v in allowed if v in values]
+
+def init_routine_api_routes(app):
+    @app.route("/api/routine/<section>")
+    def routine_api(section):
+        """Columnar routine for programmatic clients.
+
+        ?fields=teacher,course,lab,room and ?days=Monday,Tuesday trim the
+        payload; ?format=msgpack (or Accept: application/msgpack) switches
+        from JSON; gzip is applied when the client accepts it.
+        """
+        if not re.fullmatch(r"\w+", section):
+            return jsonify(error="unknown section"), 404
+        routine_table = f"{section}_routine"
+        fields = csv_arg("fields", COLUMNAR_FIELDS)
+        use_msgpack = wants_msgpack()
+        use_gzip = "gzip" in request.accept_encodings
+
+        # Every representation gets its own validator: format and encoding are part of the key
+        version = table_version(routine_table)
+        key = ("api", routine_table, version, tuple(fields), request.args.get("days"),
+               "msgpack" if use_msgpack else "json", "gzip" if use_gzip else "identity")
+        etag = etag_for(key)
+        last_modified = table_modified_at(routine_table)
+        if is_not_modified(etag):
+            response = make_response("", 304)
+        else:
+            conn = get_db_connection()
+            cur = conn.cursor()
+            try:
+                view = load_routine_view(cur, routine_table)
+            except get_backend().Error:
+                return jsonify(error="unknown section"), 404
+            finally:
+                cur.close()
+                conn.close()
+
+            days = csv_arg("days", view.days)
+            view.days = days
+            payload = dict(view.columnar(fields), section=section, version=version)
+
+            if use_msgpack:
+                try:
+                    import msgpack
+                except ImportError:
+                    response = jsonify(error="MessagePack is not available on this server; use format=json")
+                    response.status_code = 406
+                    response.vary.add("Accept")
+                    return response
+                body = msgpack.packb(payload)
+                mimetype = "application/msgpack"
+            else:
+                body = json.dumps(payload, separators=(",", ":")).encode()
+                mimetype = "application/json"
+
+            response = make_response(body)
+            response.mimetype = mimetype
+            if use_gzip and len(body) >= GZIP_MIN_BYTES:
+                response.set_data(gzip.compress(body, compresslevel=6))
+                response.headers["Content-Encoding"] = "gzip"
+
+        # The body depends on Accept (format) and Accept-Encoding; 304s must say so too
+        response.vary.add("Accept")
+        response.vary.add("Accept-Encoding")
+        response.set_etag(etag, weak=True)
+        response.last_modified = last_modified
+        response.cache_control.no_cache = True
+        return response
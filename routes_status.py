@@ -0,0 +1,33 @@
+from flask import jsonify, Response
+from db import pool_stats
+from render_cache import render_cache
+from query_cache import query_cache
+from sql_metrics import sql_metrics
+
+def init_status_routes(app):
+    @app.route("/status/db-pool")
+    def db_pool_status():
+        return jsonify(pool_stats())
+
+    @app.route("/status/render-cache")
+    def render_cache_status():
+        return jsonify(render_cache.stats())
+
+    @app.route("/status/query-cache")
+    def query_cache_status():
+        return jsonify(query_cache.stats())
+
+    @app.route("/metrics")
+    def metrics():
+        """Prometheus text exposition of this worker's SQL, pool, render-cache and query-cache statistics."""
+        lines = [sql_metrics.render_prometheus().rstrip("\n")]
+        for name, value in sorted(pool_stats().items()):
+            lines.append(f"# TYPE hh_db_pool_{name} gauge")
+            lines.append(f"hh_db_pool_{name} {value}")
+        for name, value in sorted(render_cache.stats().items()):
+            lines.append(f"# TYPE hh_render_cache_{name} gauge")
+            lines.append(f"hh_render_cache_{name} {value}")
+        for name, value in sorted(query_cache.stats().items()):
+            lines.append(f"# TYPE hh_query_cache_{name} gauge")
+            lines.append(f"hh_query_cache_{name} {value}")
+        return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
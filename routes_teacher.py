@@ -0,0 +1,34 @@
+from flask import render_template, Response, url_for
+from db import get_db_connection
+from teacher_index import load_teacher_view
+from routine_pdf import build_routine_pdf
+
+def teacher_view(name):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    view = load_teacher_view(cur, name)
+    cur.close()
+    conn.close()
+    return view
+
+def init_teacher_routes(app):
+    @app.route("/teacher/<name>")
+    def teacher_routine(name):
+        """One teacher's week across every section, read from the teacher index."""
+        view = teacher_view(name)
+        return render_template(
+            "view_routine.html",
+            slot_labels=view.slot_labels,
+            table_rows=view.table_rows(),
+            title=f"Routine for {name}",
+            download_url=url_for("download_teacher_routine", name=name)
+        )
+
+    @app.route("/teacher/<name>/pdf")
+    def download_teacher_routine(name):
+        pdf_bytes = build_routine_pdf(f"Routine for {name}", teacher_view(name))
+        return Response(
+            pdf_bytes,
+            mimetype="application/pdf",
+            headers={"Content-Disposition": "attachment;filename=teacher_routine.pdf"}
+        )
@@ -1,7 +1,9 @@
 from flask import render_template, request, redirect, url_for, session
-from datetime import datetime, timedelta
 import re
 from db import get_db_connection, WEEK_DAYS
+from routine_grid import build_day_template, build_slot_rows, days_between
+from table_versions import bump_table_version
+from teacher_index import refresh_teacher_index
 
 def init_time_slots_routes(app):
     @app.route("/time-slots", methods=["GET", "POST"])
@@ -45,43 +47,26 @@ def init_time_slots_routes(app):
                 ) 
             """)
 
-            cur.execute(f"DELETE FROM {routine_table}")
-
-            fmt = "%H:%M"
-            start_dt = datetime.strptime(start_time, fmt)
-            end_dt = datetime.strptime(end_time, fmt)
-            break_s = datetime.strptime(break_start, fmt)
-            break_e = datetime.strptime(break_end, fmt)
-
-            s_idx = WEEK_DAYS.index(start_day)
-            e_idx = WEEK_DAYS.index(end_day)
-            if s_idx <= e_idx:
-                days_range = WEEK_DAYS[s_idx:e_idx + 1]
-            else:
-                days_range = WEEK_DAYS[s_idx:] + WEEK_DAYS[:e_idx + 1]
-
-            for day in days_range:
-                current = start_dt
-                while current < end_dt:
-                    next_slot = current + timedelta(minutes=slot_duration)
-                    slot_label = f"{current.strftime('%H:%M')} - {next_slot.strftime('%H:%M')}"
-
-                    if break_s <= current < break_e:
-                        cur.execute(
-                            f"INSERT INTO {routine_table} (day, time_slot, slot_start, slot_end) VALUES (%s, %s, %s, %s)",
-                            (day, "BREAK", current.time(), next_slot.time())
-                        )
-                    else:
-                        cur.execute(
-                            f"INSERT INTO {routine_table} (day, time_slot, slot_start, slot_end) VALUES (%s, %s, %s, %s)",
-                            (day, slot_label, current.time(), next_slot.time())
-                        )
-
-                    current = next_slot
+            # Build one day in Python and clone it across the selected days
+            template = build_day_template(start_time, end_time, slot_duration, break_start, break_end)
+            slot_rows = build_slot_rows(days_between(start_day, end_day), template)
+
+            # Swap the old grid for the new one in a single transaction
+            try:
+                cur.execute(f"DELETE FROM {routine_table}")
+                cur.executemany(
+                    f"INSERT INTO {routine_table} (day, time_slot, slot_start, slot_end) VALUES (%s, %s, %s, %s)",
+                    slot_rows
+                )
+            except Exception:
+                conn.rollback()
+                raise
 
             conn.commit()
             cur.close()
+            refresh_teacher_index(conn, routine_table)
             conn.close()
+            bump_table_version(routine_table)
 
             return redirect(url_for("assign_courses"))
 
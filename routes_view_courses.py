@@ -1,28 +1,111 @@
-from flask import render_template, redirect, url_for, session
+from flask import render_template, redirect, url_for, session, request, stream_template
 from db import get_db_connection
+from query_cache import query_cache
+
+COURSES_PAGE_SIZE = 100
+MAX_COURSES_PAGE_SIZE = 1000
+STREAM_FETCH_SIZE = 500
+# A streamed listing is cached afterwards only if it is at most this many rows
+STREAM_CACHE_MAX_ROWS = 5000
+
+
+class StreamedRows:
+    """Iterate a cursor in fetchmany() chunks; truthy if the result has any rows (peeks the first chunk).
+
+    If on_complete is given it receives all rows once a result of at most
+    STREAM_CACHE_MAX_ROWS has been fully streamed.
+    """
+
+    def __init__(self, cur, conn, on_complete=None):
+        self._cur = cur
+        self._conn = conn
+        self._chunk = None
+        self._seen_any = False
+        self._on_complete = on_complete
+
+    def _next_chunk(self):
+        chunk = self._cur.fetchmany(STREAM_FETCH_SIZE)
+        if chunk:
+            self._seen_any = True
+        return chunk
+
+    def __bool__(self):
+        if self._chunk is None and not self._seen_any:
+            self._chunk = self._next_chunk()
+        return self._seen_any
+
+    def __iter__(self):
+        collected = [] if self._on_complete else None
+        try:
+            chunk = self._chunk if self._chunk is not None else self._next_chunk()
+            self._chunk = []
+            while chunk:
+                if collected is not None:
+                    collected.extend(chunk)
+                    if len(collected) > STREAM_CACHE_MAX_ROWS:
+                        collected = None
+                yield from chunk
+                chunk = self._next_chunk()
+            if collected is not None:
+                self._on_complete(collected)
+        finally:
+            self._cur.close()
+            self._conn.close()
+
 
 def init_view_courses_routes(app):
     @app.route("/view-courses")
     def view_courses():
+        """Stream the whole courses table, or show one keyset page with ?after=<id>&limit=<n>."""
         if "branch" not in session:
             return redirect(url_for("select_details"))
 
         courses_table = session["courses_table"]
 
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute(f"""
+        if "after" in request.args or "limit" in request.args:
+            after = request.args.get("after", 0, type=int)
+            limit = min(max(request.args.get("limit", COURSES_PAGE_SIZE, type=int), 1), MAX_COURSES_PAGE_SIZE)
+
+            conn = get_db_connection()
+            cur = conn.cursor()
+            page = query_cache.fetch(cur, courses_table, f"""
+                SELECT id, teacher_name, course_name, course_code, tutorial_time, lab_time, tutorials_per_week, labs_per_week
+                FROM {courses_table}
+                WHERE id > %s
+                ORDER BY id
+                LIMIT %s
+            """, (after, limit + 1))
+            cur.close()
+            conn.close()
+
+            next_after = page[limit - 1][0] if len(page) > limit else None
+            return render_template(
+                "teacher_information_show.html",
+                branch=session["branch"],
+                semester=session["semester"],
+                year=session["year"],
+                courses=[row[1:] for row in page[:limit]],
+                next_after=next_after,
+                limit=limit
+            )
+
+        sql = f"""
             SELECT teacher_name, course_name, course_code, tutorial_time, lab_time, tutorials_per_week, labs_per_week
             FROM {courses_table}
-        """)
-        courses = cur.fetchall()
-        cur.close()
-        conn.close()
+            ORDER BY id
+        """
+        key, courses = query_cache.lookup(courses_table, sql)
+        if courses is None:
+            # Unbuffered cursor drained in chunks while the template streams out; small results get cached
+            conn = get_db_connection()
+            cur = conn.cursor(buffered=False)
+            cur.execute(sql)
+            courses = StreamedRows(cur, conn, on_complete=lambda rows: query_cache.store(key, rows))
 
-        return render_template(
+        return stream_template(
             "teacher_information_show.html",
             branch=session["branch"],
             semester=session["semester"],
             year=session["year"],
             courses=courses
-        )
\ No newline at end of file
+        )
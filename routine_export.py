@@ -0,0 +1,98 @@
+import os
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from batch_scheduler import discover_sections
+from routine_view import build_view, load_routine_view
+from routine_pdf import build_routine_pdf, section_title
+from schema import split_prefix
+
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", str(os.cpu_count() or 1)))
+
+
+def teacher_views(section_views):
+    """Per-teacher RoutineViews from section views; cells are (section, code, is_lab, classroom)."""
+    placed = {}
+    for prefix, view in section_views:
+        for day in view.days:
+            for label, cell in zip(view.slot_labels, view.cells[day]):
+                if isinstance(cell, tuple):
+                    teacher, code, is_lab, classroom = cell
+                    placed.setdefault(teacher, []).append((day, label, (prefix, code, is_lab, classroom)))
+    return {teacher: build_view(entries) for teacher, entries in sorted(placed.items())}
+
+
+def safe_filename(name, used):
+    base = re.sub(r'\W+', '_', name).strip("_") or "unnamed"
+    candidate, n = base, 1
+    while candidate in used:
+        n += 1
+        candidate = f"{base}_{n}"
+    used.add(candidate)
+    return candidate
+
+
+def load_export_items(cur, sections=True, teachers=True):
+    """(zip entry name, title, RoutineView) for every section and/or teacher timetable."""
+    section_views = [(p, load_routine_view(cur, f"{p}_routine")) for p in discover_sections(cur)]
+    items = []
+    if sections:
+        for prefix, view in section_views:
+            branch, semester, year = split_prefix(prefix)
+            items.append((f"sections/{prefix}.pdf", section_title(branch.upper(), semester, year), view))
+    if teachers:
+        used = set()
+        for teacher, view in teacher_views(section_views).items():
+            items.append((f"teachers/{safe_filename(teacher, used)}.pdf", f"Routine for {teacher}", view))
+    return items
+
+
+def render_pdfs(items, workers=EXPORT_WORKERS):
+    """Yield (name, pdf bytes) in order; at most 2 * workers PDFs are in flight at once."""
+    if workers <= 1 or len(items) <= 1:
+        for name, title, view in items:
+            yield name, build_routine_pdf(title, view)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        pending = deque()
+        for name, title, view in items:
+            pending.append((name, pool.submit(build_routine_pdf, title, view)))
+            if len(pending) >= 2 * workers:
+                done_name, future = pending.popleft()
+                yield done_name, future.result()
+        while pending:
+            done_name, future = pending.popleft()
+            yield done_name, future.result()
+
+
+class ChunkSink:
+    """Write-only file object; zipfile falls back to streaming mode because it can't seek."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_export_zip(items, workers=EXPORT_WORKERS, progress=None):
+    """Stream a ZIP of rendered PDFs chunk by chunk; progress(done, total) is called after each entry."""
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+        for done, (name, pdf) in enumerate(render_pdfs(items, workers), 1):
+            zf.writestr(name, pdf)
+            if progress:
+                progress(done, len(items))
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,538 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+import random
+from db import WEEK_DAYS
+from storage import time_value_to_minutes as time_to_minutes
+
+
+def minutes_label(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def days_between(start_day, end_day):
+    """Days from start_day to end_day inclusive, wrapping around the week."""
+    s_idx = WEEK_DAYS.index(start_day)
+    e_idx = WEEK_DAYS.index(end_day)
+    if s_idx <= e_idx:
+        return WEEK_DAYS[s_idx:e_idx + 1]
+    return WEEK_DAYS[s_idx:] + WEEK_DAYS[:e_idx + 1]
+
+
+def build_day_template(start_time, end_time, slot_duration, break_start, break_end):
+    """Build one day's (time_slot, slot_start, slot_end) rows from HH:MM form values."""
+    fmt = "%H:%M"
+    start_dt = datetime.strptime(start_time, fmt)
+    end_dt = datetime.strptime(end_time, fmt)
+    break_s = datetime.strptime(break_start, fmt)
+    break_e = datetime.strptime(break_end, fmt)
+
+    template = []
+    current = start_dt
+    while current < end_dt:
+        next_slot = current + timedelta(minutes=slot_duration)
+        if break_s <= current < break_e:
+            slot_label = "BREAK"
+        else:
+            slot_label = f"{current.strftime('%H:%M')} - {next_slot.strftime('%H:%M')}"
+        template.append((slot_label, current.time(), next_slot.time()))
+        current = next_slot
+    return template
+
+
+def build_slot_rows(days_range, template):
+    """Clone a day template across days as (day, time_slot, slot_start, slot_end) rows."""
+    return [(day,) + slot for day in days_range for slot in template]
+
+
+def session_label(teacher, code, is_lab):
+    return f"{teacher} {code}" + (" LAB" if is_lab else "")
+
+
+def cell_state(cell):
+    return cell["time_slot"], cell["teacher"], cell["code"], bool(cell["is_lab"]), cell["classroom"]
+
+
+class FreeIntervals:
+    """Maximal runs of back-to-back free cells on one day, kept as sorted [start, end) positions.
+
+    Occupying or releasing a cell splits or merges at most two runs, found
+    by bisection; queries walk the runs rather than every cell.
+    """
+
+    def __init__(self, day_cells, slot_minutes):
+        self.day_cells = day_cells
+        self.slot_minutes = slot_minutes
+        self.slot_starts = [c["start"] for c in day_cells]
+        # linked[i]: cell i + 1 starts exactly one slot after cell i
+        self.linked = [
+            i + 1 < len(day_cells) and day_cells[i + 1]["start"] - c["start"] == slot_minutes
+            for i, c in enumerate(day_cells)
+        ]
+        self.starts = []
+        self.ends = []
+        run_start = None
+        for i, cell in enumerate(day_cells):
+            if self.is_free(i) and run_start is None:
+                run_start = i
+            if run_start is not None and (not self.is_free(i) or not self.linked[i]):
+                end = i + 1 if self.is_free(i) else i
+                if end > run_start:
+                    self.starts.append(run_start)
+                    self.ends.append(end)
+                run_start = None
+        if run_start is not None:
+            self.starts.append(run_start)
+            self.ends.append(len(day_cells))
+        self.teachable = sum(1 for c in day_cells if not c["is_break"])
+        self.free_count = sum(e - s for s, e in zip(self.starts, self.ends))
+
+    def is_free(self, i):
+        cell = self.day_cells[i]
+        return cell["teacher"] is None and not cell["is_break"]
+
+    def _run_at(self, pos):
+        i = bisect_right(self.starts, pos) - 1
+        if i >= 0 and pos < self.ends[i]:
+            return i
+        return None
+
+    def occupy(self, pos):
+        i = self._run_at(pos)
+        if i is None:
+            return
+        self.free_count -= 1
+        start, end = self.starts.pop(i), self.ends.pop(i)
+        if pos + 1 < end:
+            self.starts.insert(i, pos + 1)
+            self.ends.insert(i, end)
+        if start < pos:
+            self.starts.insert(i, start)
+            self.ends.insert(i, pos)
+
+    def release(self, pos):
+        if self.day_cells[pos]["is_break"] or self._run_at(pos) is not None:
+            return
+        self.free_count += 1
+        start, end = pos, pos + 1
+        i = bisect_left(self.starts, pos)
+        # Merge with the run ending right before pos and the one starting right after it
+        if i > 0 and self.ends[i - 1] == pos and self.linked[pos - 1]:
+            i -= 1
+            start = self.starts.pop(i)
+            self.ends.pop(i)
+        if i < len(self.starts) and self.starts[i] == pos + 1 and self.linked[pos]:
+            self.starts.pop(i)
+            end = self.ends.pop(i)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+
+    def windows(self, length):
+        """Every window of `length` free, back-to-back cells, as (first, last + 1) positions."""
+        return [(p, p + length) for s, e in zip(self.starts, self.ends) for p in range(s, e - length + 1)]
+
+    def pick(self, length, prefer="morning", split_minutes=12 * 60, rng=random):
+        """A random window of `length` free cells, or None.
+
+        prefer="morning" draws from windows starting before split_minutes and
+        falls back to the afternoon; "afternoon" is the reverse and None
+        draws from the whole day. Ties within the chosen half are broken
+        uniformly at random.
+        """
+        split = bisect_left(self.slot_starts, split_minutes)
+        halves = {
+            "morning": ((0, split), (split, len(self.day_cells))),
+            "afternoon": ((split, len(self.day_cells)), (0, split)),
+            None: ((0, len(self.day_cells)),),
+        }[prefer]
+        for lo, hi in halves:
+            spans = []
+            total = 0
+            for s, e in zip(self.starts, self.ends):
+                first, last = max(s, lo), min(e - length, hi - 1)
+                if first <= last:
+                    spans.append((first, last - first + 1))
+                    total += last - first + 1
+            if not total:
+                continue
+            r = rng.randrange(total)
+            for first, count in spans:
+                if r < count:
+                    return self.day_cells[first + r:first + r + length]
+                r -= count
+        return None
+
+
+class RoutineGrid:
+    """In-memory copy of one routine table: day -> list of slot cells ordered by start time."""
+
+    def __init__(self, rows):
+        self.cells = {}
+        for day, slot_start, slot_end, time_slot, teacher, code, is_lab, classroom in rows:
+            start = time_to_minutes(slot_start)
+            end = time_to_minutes(slot_end)
+            self.cells.setdefault(day, []).append({
+                "slot_start": slot_start,
+                "slot_end": slot_end,
+                "start": start,
+                "end": end,
+                "is_break": time_slot == "BREAK",
+                "time_slot": time_slot,
+                "teacher": teacher,
+                "code": code,
+                "is_lab": bool(is_lab),
+                "classroom": classroom,
+            })
+        for day_cells in self.cells.values():
+            day_cells.sort(key=lambda c: c["start"])
+        self.days = sorted(self.cells, key=lambda d: WEEK_DAYS.index(d) if d in WEEK_DAYS else len(WEEK_DAYS))
+        self._free = {}
+        self._positions = None
+        # What the routine table holds for each cell, so write_grid can send only the changes
+        self._stored = {(day, c["start"]): cell_state(c) for day in self.days for c in self.cells[day]}
+
+    def __getstate__(self):
+        # Indexes are keyed by cell identity, which doesn't survive pickling; rebuild them on demand
+        state = dict(self.__dict__)
+        state["_free"] = {}
+        state["_positions"] = None
+        return state
+
+    def adopt(self, other):
+        """Take over another grid's cells, e.g. the winner of a parallel placement (what's stored stays ours)."""
+        self.cells = other.cells
+        self.days = other.days
+        self._free = {}
+        self._positions = None
+
+    def free_index(self, day, slot_minutes):
+        """The day's FreeIntervals, built on first use and then kept current by assign()/free()."""
+        index = self._free.get(day)
+        if index is None or index.slot_minutes != slot_minutes:
+            index = FreeIntervals(self.cells[day], slot_minutes)
+            self._free[day] = index
+        return index
+
+    def _track(self, cell, free):
+        if not self._free:
+            return
+        if self._positions is None:
+            self._positions = {id(c): (day, i) for day in self.days for i, c in enumerate(self.cells[day])}
+        day, i = self._positions[id(cell)]
+        index = self._free.get(day)
+        if index is not None:
+            if free:
+                index.release(i)
+            else:
+                index.occupy(i)
+
+    def slot_minutes(self):
+        for day in self.days:
+            for cell in self.cells[day]:
+                return cell["end"] - cell["start"]
+        return 0
+
+    def changed_rows(self):
+        """Routine-table rows for the cells that differ from what was loaded or last written."""
+        return [
+            (day, c["slot_start"], c["slot_end"], c["time_slot"], c["teacher"], c["code"], c["is_lab"], c["classroom"])
+            for day in self.days
+            for c in self.cells[day]
+            if self._stored.get((day, c["start"])) != cell_state(c)
+        ]
+
+    def mark_stored(self):
+        self._stored = {(day, c["start"]): cell_state(c) for day in self.days for c in self.cells[day]}
+
+    def active_days(self):
+        return [d for d in self.days if any(not c["is_break"] for c in self.cells[d])]
+
+    def assign(self, cell, teacher, code, is_lab):
+        cell["teacher"] = teacher
+        cell["code"] = code
+        cell["is_lab"] = bool(is_lab)
+        cell["time_slot"] = session_label(teacher, code, is_lab)
+        self._track(cell, free=False)
+
+    def free(self, cell):
+        cell["teacher"] = None
+        cell["code"] = None
+        cell["is_lab"] = False
+        cell["classroom"] = None
+        cell["time_slot"] = f"{minutes_label(cell['start'])} - {minutes_label(cell['end'])}"
+        self._track(cell, free=True)
+
+    def clear_assignments(self):
+        """Free every non-break cell (breaks are kept)."""
+        for day in self.days:
+            for cell in self.cells[day]:
+                if not cell["is_break"]:
+                    self.free(cell)
+
+    def day_load(self, day):
+        index = self._free.get(day)
+        if index is not None:
+            return index.teachable - index.free_count
+        return sum(1 for c in self.cells[day] if c["teacher"] is not None and not c["is_break"])
+
+    def has_tutorial(self, day, teacher):
+        return any(c["teacher"] == teacher and not c["is_lab"] and not c["is_break"] for c in self.cells[day])
+
+    def free_runs(self, day, length, slot_minutes):
+        """Return every window of `length` back-to-back free cells on a day."""
+        day_cells = self.cells[day]
+        return [day_cells[a:b] for a, b in self.free_index(day, slot_minutes).windows(length)]
+
+    def pick_free_run(self, day, length, slot_minutes, prefer="morning"):
+        """A random window of `length` free cells, preferring ones that start in the `prefer` half of the day."""
+        return self.free_index(day, slot_minutes).pick(length, prefer)
+
+
+def load_grid(cur, routine_table):
+    cur.execute(f"""
+        SELECT day, slot_start, slot_end, time_slot, teacher_name, course_code, is_lab, classroom
+        FROM {routine_table}
+        ORDER BY day, slot_start
+    """)
+    return RoutineGrid(cur.fetchall())
+
+
+def write_grid(cur, routine_table, grid):
+    """Write the cells that changed since the grid was loaded in a single multi-row upsert.
+
+    Returns the number of rows sent; the caller commits.
+    """
+    rows = grid.changed_rows()
+    if not rows:
+        return 0
+    cur.executemany(f"""
+        INSERT INTO {routine_table}
+        (day, slot_start, slot_end, time_slot, teacher_name, course_code, is_lab, classroom)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            time_slot = VALUES(time_slot),
+            teacher_name = VALUES(teacher_name),
+            course_code = VALUES(course_code),
+            is_lab = VALUES(is_lab),
+            classroom = VALUES(classroom)
+    """, rows)
+    grid.mark_stored()
+    return len(rows)
+
+
+def hours_to_slots(hours, slot_minutes):
+    if slot_minutes <= 0:
+        return 0
+    return int((hours * 60) / slot_minutes)
+
+
+def load_course_lists(cur, courses_table, slot_minutes):
+    """Fetch (teacher, code, session_time, per_week, is_lab) rows for labs and tutorials in placement order."""
+    cur.execute(f"""
+        SELECT teacher_name, course_code, lab_time, labs_per_week, TRUE AS is_lab
+        FROM {courses_table}
+        WHERE lab_time IS NOT NULL AND labs_per_week > 0
+    """)
+    labs = cur.fetchall()
+    labs.sort(key=lambda x: (hours_to_slots(int(x[2].split()[0]), slot_minutes), x[3]), reverse=True)
+
+    cur.execute(f"""
+        SELECT teacher_name, course_code, tutorial_time, tutorials_per_week, FALSE AS is_lab
+        FROM {courses_table}
+        WHERE tutorial_time IS NOT NULL AND tutorials_per_week > 0
+    """)
+    tutorials = cur.fetchall()
+    tutorials.sort(key=lambda x: x[3], reverse=True)
+    return labs, tutorials
+
+
+def place_courses(grid, course_list, slot_minutes, even_distribution=False, force_unique_days=False,
+                  prefer="morning"):
+    """Place (teacher, code, session_time, sessions_needed, is_lab) rows into free runs of the grid.
+
+    prefer ("morning", "afternoon" or None) picks which half of a day is tried first.
+    """
+    all_days = grid.active_days()
+    used_days_for_labs = set() if force_unique_days else None
+    unplaced = []
+
+    for teacher, code, session_time, sessions_needed, is_lab in course_list:
+        try:
+            hours = int(session_time.split()[0])
+        except Exception:
+            continue
+
+        required_slots = hours_to_slots(hours, slot_minutes)
+        if required_slots <= 0:
+            continue
+
+        booked = 0
+        attempts = 0
+        max_attempts = len(all_days) * 4
+
+        while booked < sessions_needed and attempts < max_attempts:
+            sorted_days = sorted(all_days, key=grid.day_load)
+
+            if force_unique_days:
+                available_days = [d for d in sorted_days if d not in used_days_for_labs]
+                if not available_days:
+                    used_days_for_labs.clear()
+                    available_days = sorted_days
+                sorted_days = available_days
+
+            if not even_distribution:
+                random.shuffle(sorted_days)
+
+            for day in sorted_days:
+                # Limit 1 tutorial per day per teacher
+                if not is_lab and grid.has_tutorial(day, teacher):
+                    continue
+
+                # Preferred half of the day first, uniformly random within each half
+                run = grid.pick_free_run(day, required_slots, slot_minutes, prefer)
+                if run is None:
+                    continue
+
+                for cell in run:
+                    grid.assign(cell, teacher, code, is_lab)
+
+                booked += 1
+                if force_unique_days:
+                    used_days_for_labs.add(day)
+                break
+
+            attempts += 1
+
+        if booked < sessions_needed:
+            unplaced.append((teacher, code, sessions_needed - booked, bool(is_lab)))
+
+    return unplaced
+
+
+# Day-level passes work on a plain list per day: BREAK, None (free) or a (teacher, code, is_lab) tuple
+BREAK = "BREAK"
+
+
+def day_assignments(grid, day):
+    return [
+        BREAK if c["is_break"] else None if c["teacher"] is None else (c["teacher"], c["code"], c["is_lab"])
+        for c in grid.cells[day]
+    ]
+
+
+def apply_day(grid, day, slots):
+    """Write a day's assignment list back onto the grid, touching only the cells that changed."""
+    for cell, new in zip(grid.cells[day], slots):
+        if new is BREAK:
+            continue
+        old = None if cell["teacher"] is None else (cell["teacher"], cell["code"], cell["is_lab"])
+        if new == old:
+            continue
+        if new is None:
+            grid.free(cell)
+        else:
+            grid.assign(cell, *new)
+
+
+def free_windows(slots, starts, length, slot_minutes):
+    """Index ranges of every window of `length` back-to-back free entries."""
+    windows = []
+    run_start = 0
+    for i, entry in enumerate(slots):
+        is_free = entry is None
+        if not is_free or (i > run_start and starts[i] - starts[i - 1] != slot_minutes):
+            run_start = i if is_free else i + 1
+        if is_free and i - run_start + 1 >= length:
+            windows.append(range(i - length + 1, i + 1))
+    return windows
+
+
+def lab_blocks(slots, indices):
+    """Group lab entries at the given indices into contiguous (teacher, code) blocks."""
+    blocks = []
+    for i in indices:
+        entry = slots[i]
+        if entry in (None, BREAK) or not entry[2]:
+            continue
+        if blocks and blocks[-1][-1] == i - 1 and slots[i - 1] == entry:
+            blocks[-1].append(i)
+        else:
+            blocks.append([i])
+    return blocks
+
+
+def balance_day(slots, starts, slot_minutes, rng=random):
+    """Return a copy of one day with whole lab sessions moved across the break towards a ~50:50 split."""
+    slots = list(slots)
+    break_index = next((i for i, entry in enumerate(slots) if entry is BREAK), None)
+    if break_index is None:
+        return slots
+
+    before_labs = lab_blocks(slots, range(0, break_index))
+    after_labs = lab_blocks(slots, range(break_index + 1, len(slots)))
+    total_labs_day = len(before_labs) + len(after_labs)
+
+    if total_labs_day <= 1:
+        return slots
+
+    target_before = total_labs_day // 2
+    target_after = total_labs_day - target_before
+    if total_labs_day % 2 == 1:
+        if rng.choice([True, False]):
+            target_before += 1
+        else:
+            target_after += 1
+
+    for source, to_after, target in ((before_labs, True, target_before),
+                                     (after_labs, False, target_after)):
+        while len(source) > target:
+            block = source.pop()
+            lab = slots[block[0]]
+            candidates = [
+                window for window in free_windows(slots, starts, len(block), slot_minutes)
+                if (window[0] > break_index) == to_after
+            ]
+            if not candidates:
+                break
+            for i in block:
+                slots[i] = None
+            for i in rng.choice(candidates):
+                slots[i] = lab
+    return slots
+
+
+def compact_day(slots):
+    """Return a copy of one day with classes pulled to the front of each break-delimited segment.
+
+    A segment that starts right after a break opens with a tutorial rather
+    than a lab when it has one.
+    """
+    compacted = []
+    segment = []
+    after_break = False
+    for entry in slots + [BREAK]:
+        if entry is not BREAK:
+            segment.append(entry)
+            continue
+        classes = [e for e in segment if e is not None]
+        if after_break and classes and classes[0][2]:
+            for idx in range(1, len(classes)):
+                if not classes[idx][2]:
+                    classes[0], classes[idx] = classes[idx], classes[0]
+                    break
+        compacted += classes + [None] * (len(segment) - len(classes)) + [BREAK]
+        segment = []
+        after_break = True
+    return compacted[:-1]
+
+
+def balance_labs(grid, slot_minutes):
+    """Move whole lab sessions across the break so each day has ~50:50 labs before/after it."""
+    for day in grid.active_days():
+        starts = [c["start"] for c in grid.cells[day]]
+        apply_day(grid, day, balance_day(day_assignments(grid, day), starts, slot_minutes))
+
+
+def compact_days(grid):
+    """Pull classes to the front of each break-delimited segment; avoid a lab right after a break."""
+    for day in grid.active_days():
+        apply_day(grid, day, compact_day(day_assignments(grid, day)))
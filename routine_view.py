@@ -0,0 +1,132 @@
+from db import WEEK_DAYS
+from storage import time_value_to_time
+from query_cache import query_cache
+
+
+def format_time_range(start, end):
+    """Convert TIME values from any backend into an HH:MM - HH:MM range."""
+    return f"{time_value_to_time(start).strftime('%H:%M')} - {time_value_to_time(end).strftime('%H:%M')}"
+
+
+BREAK = "Break"
+FREE = "Free"
+
+# Cell codes in the columnar form; anything >= 0 indexes a dictionary
+FREE_CODE = -1
+BREAK_CODE = -2
+COLUMNAR_FIELDS = ("teacher", "course", "lab", "room")
+
+
+class RoutineView:
+    """Day x slot matrix of a routine table, shared by the HTML and PDF renderers.
+
+    Each cell is FREE, BREAK or a (teacher, code, is_lab, classroom) tuple.
+    """
+
+    def __init__(self, days, slot_labels, cells):
+        self.days = days
+        self.slot_labels = slot_labels
+        self.cells = cells
+
+    def display_text(self, cell, sep="\n"):
+        if cell in (FREE, BREAK):
+            return cell
+        teacher, code, is_lab, classroom = cell
+        text = f"{teacher}{sep}{code}"
+        if is_lab:
+            text += " (Lab)"
+        if classroom:
+            text += f"{sep}Room: {classroom}"
+        return text
+
+    def table_rows(self):
+        return [[day] + [self.display_text(c) for c in self.cells[day]] for day in self.days]
+
+    def columnar(self, fields=COLUMNAR_FIELDS):
+        """Compact form for API clients: one days x slots int matrix per field plus name dictionaries.
+
+        teacher/course/room cells index their dictionary, lab cells are 0/1,
+        and FREE_CODE / BREAK_CODE mark free and break slots in every field.
+        """
+        dictionaries = {"teacher": {}, "course": {}, "room": {}}
+        positions = {"teacher": 0, "course": 1, "lab": 2, "room": 3}
+        cells = {field: [] for field in fields}
+        for day in self.days:
+            rows = {field: [] for field in fields}
+            for cell in self.cells[day]:
+                for field in fields:
+                    if cell == FREE or cell == BREAK:
+                        rows[field].append(FREE_CODE if cell == FREE else BREAK_CODE)
+                        continue
+                    value = cell[positions[field]]
+                    if field == "lab":
+                        rows[field].append(int(value))
+                    elif value is None:
+                        rows[field].append(FREE_CODE)
+                    else:
+                        rows[field].append(dictionaries[field].setdefault(value, len(dictionaries[field])))
+            for field in fields:
+                cells[field].append(rows[field])
+
+        data = {"days": self.days, "slots": self.slot_labels, "cells": cells}
+        for field in fields:
+            if field in dictionaries:
+                data[field + "s"] = list(dictionaries[field])
+        return data
+
+    def pdf_table_data(self):
+        data = [['Day \\ Time'] + self.slot_labels]
+        for day in self.days:
+            data.append([day] + [self.display_text(c, sep=" / ") for c in self.cells[day]])
+        return data
+
+
+def build_view(entries):
+    """RoutineView from (day, slot_label, cell) entries, e.g. one teacher's sessions across sections.
+
+    Only days and slots that appear in the entries get a row or column.
+    """
+    # "HH:MM - HH:MM" labels sort chronologically
+    labels = sorted({label for _, label, _ in entries})
+    present = {day for day, _, _ in entries}
+    days = [day for day in WEEK_DAYS if day in present]
+    index = {label: i for i, label in enumerate(labels)}
+    cells = {day: [FREE] * len(labels) for day in days}
+    for day, label, cell in entries:
+        cells[day][index[label]] = cell
+    return RoutineView(days, labels, cells)
+
+
+def load_routine_view(cur, routine_table, days=None):
+    """Build the routine matrix with exactly two queries (slot headers + all rows).
+
+    days=None shows every day that has rows in the table, in week order.
+    Both reads go through the query cache.
+    """
+    slot_rows = query_cache.fetch(cur, routine_table, f"""
+        SELECT DISTINCT slot_start, slot_end
+        FROM {routine_table}
+        ORDER BY slot_start
+    """)
+    slot_labels = [format_time_range(s[0], s[1]) for s in slot_rows]
+    slot_index = {label: i for i, label in enumerate(slot_labels)}
+
+    rows = query_cache.fetch(cur, routine_table, f"""
+        SELECT day, slot_start, slot_end, time_slot, teacher_name, course_code, is_lab, classroom
+        FROM {routine_table}
+        ORDER BY day, slot_start
+    """)
+    if days is None:
+        present = {row[0] for row in rows}
+        days = [day for day in WEEK_DAYS if day in present]
+    cells = {day: [FREE] * len(slot_labels) for day in days}
+    for day, start, end, time_slot, teacher, code, is_lab, classroom in rows:
+        if day not in cells:
+            continue
+        i = slot_index[format_time_range(start, end)]
+        if teacher:
+            cells[day][i] = (teacher, code, bool(is_lab), classroom)
+        elif time_slot == "BREAK":
+            cells[day][i] = BREAK
+
+    return RoutineView(days, slot_labels, cells)
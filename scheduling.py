@@ -0,0 +1,76 @@
+from routine_grid import place_courses, balance_labs, compact_days
+from solver import solve, apply_solution
+from incremental import reschedule_incremental
+
+
+class ScheduleOutcome:
+    """status is "complete", "partial", "infeasible" or "timeout"; report is JSON-serialisable."""
+
+    def __init__(self, status, report):
+        self.status = status
+        self.report = report
+
+    @property
+    def writable(self):
+        return self.status in ("complete", "partial")
+
+
+def unplaced_report(unplaced):
+    return [{"teacher": t, "course_code": c, "sessions": n, "is_lab": lab} for t, c, n, lab in unplaced]
+
+
+def schedule_grid(grid, labs, tutorials, engine="random", seed=0, time_limit=5.0, teacher_busy=None,
+                  attempts=None):
+    """Place labs and tutorials on the grid with the chosen engine.
+
+    "random" and "solver" rebuild the grid from scratch; "multistart" keeps the
+    best of `attempts` parallel random runs within time_limit seconds;
+    "incremental" keeps existing placements and only places what the course
+    lists added or changed.
+    """
+    required = sum(row[3] for row in labs + tutorials)
+    if engine == "multistart":
+        from multistart import best_of, MULTISTART_ATTEMPTS
+        outcome, extras = best_of(grid, labs, tutorials, attempts=attempts or MULTISTART_ATTEMPTS,
+                                  seed=seed, time_limit=time_limit)
+        outcome.report.update(extras)
+        return outcome
+    if engine == "incremental":
+        result = reschedule_incremental(grid, labs, tutorials)
+        unplaced = result.pop("unplaced")
+        report = dict(result, required=required, placed=required - sum(u[2] for u in unplaced),
+                      unplaced=unplaced_report(unplaced))
+        return ScheduleOutcome("complete" if not unplaced else "partial", report)
+
+    grid.clear_assignments()
+    slot_minutes = grid.slot_minutes()
+    force_unique = sum(lab[3] for lab in labs) <= len(grid.active_days())
+
+    if engine == "solver":
+        # Deterministic constraint solver: all-or-nothing
+        result = solve(grid, labs + tutorials, slot_minutes, seed=seed, unique_lab_days=force_unique,
+                       time_limit=time_limit, teacher_busy=teacher_busy)
+        if result.status == "complete":
+            apply_solution(grid, result)
+        return ScheduleOutcome(result.status, dict(result.report, required=required,
+                                                   placed=required if result.status == "complete" else 0))
+
+    # Place labs
+    unplaced = place_courses(grid, labs, slot_minutes, even_distribution=False, force_unique_days=force_unique)
+
+    # Ensure ~50:50 split of labs before/after break
+    balance_labs(grid, slot_minutes)
+
+    # Place tutorials after labs are balanced
+    unplaced += place_courses(grid, tutorials, slot_minutes, even_distribution=True, force_unique_days=False)
+
+    # Compact days with break preservation and after-break swap
+    compact_days(grid)
+
+    placed = required - sum(u[2] for u in unplaced)
+    report = {
+        "required": required,
+        "placed": placed,
+        "unplaced": unplaced_report(unplaced),
+    }
+    return ScheduleOutcome("complete" if not unplaced else "partial", report)
@@ -0,0 +1,123 @@
+"""Normalised schema: one set of tables for every section instead of per-section dynamic tables."""
+
+SCHEMA_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS sections (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        table_prefix VARCHAR(150) NOT NULL UNIQUE,
+        branch VARCHAR(100) NOT NULL,
+        semester VARCHAR(20) NOT NULL,
+        year VARCHAR(20) NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS courses (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        section_id INTEGER NOT NULL,
+        teacher_name VARCHAR(100) NOT NULL,
+        course_name VARCHAR(100) NOT NULL,
+        course_code VARCHAR(50) NOT NULL,
+        tutorial_time VARCHAR(20) NULL,
+        lab_time VARCHAR(20) NULL,
+        tutorials_per_week INTEGER DEFAULT 0,
+        labs_per_week INTEGER DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS slots (
+        section_id INTEGER NOT NULL,
+        day VARCHAR(20) NOT NULL,
+        slot_start TIME NOT NULL,
+        slot_end TIME NOT NULL,
+        is_break BOOLEAN DEFAULT FALSE,
+        PRIMARY KEY (section_id, day, slot_start)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS assignments (
+        section_id INTEGER NOT NULL,
+        day VARCHAR(20) NOT NULL,
+        slot_start TIME NOT NULL,
+        slot_end TIME NOT NULL,
+        teacher_name VARCHAR(100) NOT NULL,
+        course_code VARCHAR(50) NOT NULL,
+        is_lab BOOLEAN DEFAULT FALSE,
+        classroom VARCHAR(20) DEFAULT NULL,
+        PRIMARY KEY (section_id, day, slot_start)
+    )
+    """,
+]
+
+# (table, index name, columns)
+SCHEMA_INDEXES = [
+    ("courses", "idx_courses_section", ("section_id",)),
+    ("courses", "idx_courses_teacher", ("teacher_name",)),
+    ("assignments", "idx_assignments_teacher_day", ("teacher_name", "day", "slot_start")),
+    ("assignments", "idx_assignments_room_day", ("classroom", "day", "slot_start")),
+]
+
+
+_schema_ready = False
+
+
+def ensure_schema(cur, backend):
+    """Create the normalised tables and indexes (once per process); DDL commits implicitly on MySQL."""
+    global _schema_ready
+    if _schema_ready:
+        return
+    for ddl in SCHEMA_TABLES:
+        cur.execute(ddl)
+    for table, name, columns in SCHEMA_INDEXES:
+        backend.ensure_index(cur, table, name, columns)
+    _schema_ready = True
+
+
+def split_prefix(prefix):
+    """Best-effort (branch, semester, year) from a `{branch}_{sem}_{year}` table prefix."""
+    parts = prefix.split("_")
+    if len(parts) < 3:
+        return prefix, "", ""
+    return "_".join(parts[:-2]), parts[-2], parts[-1]
+
+
+def ensure_section(cur, prefix, branch=None, semester=None, year=None):
+    cur.execute("SELECT id FROM sections WHERE table_prefix = %s", (prefix,))
+    row = cur.fetchone()
+    if row:
+        return row[0]
+    parsed = split_prefix(prefix)
+    cur.execute(
+        "INSERT INTO sections (table_prefix, branch, semester, year) VALUES (%s, %s, %s, %s)",
+        (prefix, branch or parsed[0], semester or parsed[1], year or parsed[2])
+    )
+    cur.execute("SELECT id FROM sections WHERE table_prefix = %s", (prefix,))
+    return cur.fetchone()[0]
+
+
+def sync_section_courses(cur, section_id, courses_table):
+    """Replace a section's normalised courses with a server-side bulk copy of its dynamic table."""
+    cur.execute("DELETE FROM courses WHERE section_id = %s", (section_id,))
+    cur.execute(f"""
+        INSERT INTO courses
+        (section_id, teacher_name, course_name, course_code, tutorial_time, lab_time, tutorials_per_week, labs_per_week)
+        SELECT %s, teacher_name, course_name, course_code, tutorial_time, lab_time, tutorials_per_week, labs_per_week
+        FROM {courses_table}
+        ORDER BY id
+    """, (section_id,))
+
+
+def sync_section_routine(cur, section_id, routine_table):
+    """Replace a section's slots and assignments with a bulk copy of its routine table."""
+    cur.execute("DELETE FROM slots WHERE section_id = %s", (section_id,))
+    cur.execute(f"""
+        INSERT INTO slots (section_id, day, slot_start, slot_end, is_break)
+        SELECT %s, day, slot_start, slot_end, time_slot = 'BREAK'
+        FROM {routine_table}
+    """, (section_id,))
+    cur.execute("DELETE FROM assignments WHERE section_id = %s", (section_id,))
+    cur.execute(f"""
+        INSERT INTO assignments (section_id, day, slot_start, slot_end, teacher_name, course_code, is_lab, classroom)
+        SELECT %s, day, slot_start, slot_end, teacher_name, course_code, is_lab, classroom
+        FROM {routine_table}
+        WHERE teacher_name IS NOT NULL AND (time_slot IS NULL OR time_slot != 'BREAK')
+    """, (section_id,))
@@ -0,0 +1,288 @@
+import random
+import time
+from routine_grid import hours_to_slots
+
+
+def popcount(x):
+    return bin(x).count("1")
+
+
+class Session:
+    """One weekly occurrence of a lab or tutorial that needs `length` back-to-back slots."""
+
+    __slots__ = ("index", "teacher", "code", "is_lab", "length")
+
+    def __init__(self, index, teacher, code, is_lab, length):
+        self.index = index
+        self.teacher = teacher
+        self.code = code
+        self.is_lab = is_lab
+        self.length = length
+
+    def describe(self):
+        kind = "lab" if self.is_lab else "tutorial"
+        return f"{self.teacher} {self.code} {kind} ({self.length} slots)"
+
+
+class SolveResult:
+    """status is "complete", "infeasible" or "timeout"; placements are (session, day, start_index)."""
+
+    def __init__(self, status, placements, report):
+        self.status = status
+        self.placements = placements
+        self.report = report
+
+
+def day_masks(grid, day, slot_minutes):
+    """Bitmask of free cells and of cells time-adjacent to the next cell on a day."""
+    cells = grid.cells[day]
+    free = 0
+    linked = 0
+    for i, cell in enumerate(cells):
+        if cell["teacher"] is None and not cell["is_break"]:
+            free |= 1 << i
+        if i + 1 < len(cells) and cells[i + 1]["start"] - cell["start"] == slot_minutes:
+            linked |= 1 << i
+    return free, linked
+
+
+def run_starts(free, linked, length):
+    """Bitmask of start positions p where cells p..p+length-1 are free and consecutive."""
+    valid = free
+    for j in range(1, length):
+        valid &= (free >> j) & (linked >> (j - 1))
+    return valid
+
+
+def block_bits(occupied, length):
+    """Start positions whose window of `length` cells would touch an occupied bit."""
+    blocked = 0
+    for j in range(length):
+        blocked |= occupied >> j
+    return blocked
+
+
+def build_sessions(course_list, slot_minutes):
+    sessions = []
+    skipped = []
+    for teacher, code, session_time, sessions_needed, is_lab in course_list:
+        try:
+            hours = int(session_time.split()[0])
+        except Exception:
+            skipped.append(f"{teacher} {code}: unreadable session time {session_time!r}")
+            continue
+        length = hours_to_slots(hours, slot_minutes)
+        if length <= 0:
+            skipped.append(f"{teacher} {code}: {session_time} is shorter than one slot")
+            continue
+        for _ in range(sessions_needed):
+            sessions.append(Session(len(sessions), teacher, code, bool(is_lab), length))
+    return sessions, skipped
+
+
+def run_lengths(free, linked, size):
+    """Lengths of maximal runs of consecutive free cells in a day of `size` cells."""
+    lengths = []
+    current = 0
+    for i in range(size):
+        if free >> i & 1:
+            current += 1
+            if not (linked >> i & 1):
+                lengths.append(current)
+                current = 0
+        elif current:
+            lengths.append(current)
+            current = 0
+    if current:
+        lengths.append(current)
+    return lengths
+
+
+def static_conflicts(sessions, days, base_domains, free_masks, day_runs):
+    """Reasons the problem is infeasible before any search."""
+    reasons = []
+    for s in sessions:
+        if not any(base_domains[s.index].values()):
+            reasons.append(f"{s.describe()}: no day has {s.length} consecutive free slots")
+
+    required = sum(s.length for s in sessions)
+    available = sum(popcount(free_masks[d]) for d in days)
+    if required > available:
+        reasons.append(f"sessions need {required} slots but only {available} free slots exist")
+
+    # Sessions of at least L slots can't outnumber the disjoint L-windows in the free runs
+    for length in sorted({s.length for s in sessions}):
+        needed = sum(1 for s in sessions if s.length >= length)
+        capacity = sum(run // length for d in days for run in day_runs[d])
+        if needed > capacity:
+            reasons.append(f"{needed} sessions need at least {length} consecutive slots but only {capacity} such blocks fit")
+
+    tutorials_per_teacher = {}
+    for s in sessions:
+        if not s.is_lab:
+            tutorials_per_teacher[s.teacher] = tutorials_per_teacher.get(s.teacher, 0) + 1
+    for teacher, count in sorted(tutorials_per_teacher.items()):
+        if count > len(days):
+            reasons.append(f"{teacher} has {count} tutorials but only {len(days)} days allow one tutorial each")
+    return reasons
+
+
+def busy_mask(grid, day, intervals):
+    """Bitmask of cells on a day overlapping any (start_minute, end_minute) interval."""
+    mask = 0
+    for i, cell in enumerate(grid.cells[day]):
+        if any(start < cell["end"] and cell["start"] < end for start, end in intervals):
+            mask |= 1 << i
+    return mask
+
+
+def solve(grid, course_list, slot_minutes, seed=0, unique_lab_days=False, time_limit=5.0, max_nodes=200000,
+          teacher_busy=None):
+    """Place every session on the grid by backtracking with forward checking over bitset domains.
+
+    Constraints: sessions occupy consecutive free slots within one day, no two
+    sessions share a slot, at most one tutorial per teacher per day and, when
+    unique_lab_days is set, at most one lab per day. The seed only breaks ties,
+    so the same input and seed always give the same schedule.
+
+    teacher_busy maps teacher -> {day: [(start_minute, end_minute), ...]} for
+    time already taken in other sections; those windows are removed from the
+    teacher's domains up front.
+    """
+    rng = random.Random(seed)
+    days = grid.active_days()
+    sessions, skipped = build_sessions(course_list, slot_minutes)
+
+    free_masks = {}
+    linked_masks = {}
+    for day in days:
+        free_masks[day], linked_masks[day] = day_masks(grid, day, slot_minutes)
+
+    domains = [
+        {day: run_starts(free_masks[day], linked_masks[day], s.length) for day in days}
+        for s in sessions
+    ]
+
+    report = {"seed": seed, "sessions": len(sessions), "skipped": skipped}
+    day_runs = {day: run_lengths(free_masks[day], linked_masks[day], len(grid.cells[day])) for day in days}
+    reasons = static_conflicts(sessions, days, domains, free_masks, day_runs)
+    if teacher_busy:
+        for s in sessions:
+            busy = teacher_busy.get(s.teacher)
+            if not busy or not any(domains[s.index].values()):
+                continue
+            for day in days:
+                if busy.get(day):
+                    domains[s.index][day] &= ~block_bits(busy_mask(grid, day, busy[day]), s.length)
+            if not any(domains[s.index].values()):
+                reasons.append(f"{s.describe()}: teacher is busy in other sections during every free run")
+
+    if reasons:
+        report["reasons"] = reasons
+        return SolveResult("infeasible", [], report)
+
+    tiebreak = {day: rng.random() for day in days}
+    session_tiebreak = [rng.random() for _ in sessions]
+    occupied = {day: 0 for day in days}
+    load = {day: 0 for day in days}
+    assignment = [None] * len(sessions)
+    unassigned = set(range(len(sessions)))
+    wipeouts = [0] * len(sessions)
+    deadline = time.monotonic() + time_limit
+    stats = {"nodes": 0, "backtracks": 0}
+
+    def domain_size(i):
+        return sum(popcount(m) for m in domains[i].values())
+
+    def candidates(s):
+        values = []
+        for day in days:
+            mask = domains[s.index][day]
+            p = 0
+            while mask:
+                if mask & 1:
+                    values.append((load[day], p, tiebreak[day], day))
+                mask >>= 1
+                p += 1
+        values.sort()
+        return [(day, p) for _, p, _, day in values]
+
+    def assign(s, day, p):
+        """Place s and prune the other domains; returns the undo trail or None on a wipe-out."""
+        bits = ((1 << s.length) - 1) << p
+        occupied[day] |= bits
+        load[day] += s.length
+        trail = []
+        blocked_by_length = {}
+        for j in unassigned:
+            t = sessions[j]
+            dom = domains[j]
+            new_mask = dom[day]
+            if t.length not in blocked_by_length:
+                blocked_by_length[t.length] = block_bits(bits, t.length)
+            new_mask &= ~blocked_by_length[t.length]
+            if not t.is_lab and not s.is_lab and t.teacher == s.teacher:
+                new_mask = 0
+            if unique_lab_days and t.is_lab and s.is_lab:
+                new_mask = 0
+            if new_mask != dom[day]:
+                trail.append((j, dom[day]))
+                dom[day] = new_mask
+                if not any(dom.values()):
+                    wipeouts[j] += 1
+                    undo(s, day, p, trail)
+                    return None
+        return trail
+
+    def undo(s, day, p, trail):
+        occupied[day] &= ~(((1 << s.length) - 1) << p)
+        load[day] -= s.length
+        for j, mask in trail:
+            domains[j][day] = mask
+
+    def search():
+        if not unassigned:
+            return "complete"
+        if stats["nodes"] >= max_nodes or time.monotonic() > deadline:
+            return "timeout"
+
+        i = min(unassigned, key=lambda j: (domain_size(j), -sessions[j].length, session_tiebreak[j]))
+        s = sessions[i]
+        unassigned.discard(i)
+        for day, p in candidates(s):
+            stats["nodes"] += 1
+            trail = assign(s, day, p)
+            if trail is None:
+                continue
+            assignment[i] = (day, p)
+            outcome = search()
+            if outcome != "infeasible":
+                return outcome
+            assignment[i] = None
+            undo(s, day, p, trail)
+            stats["backtracks"] += 1
+        unassigned.add(i)
+        return "infeasible"
+
+    status = search()
+    report.update(stats)
+
+    if status == "complete":
+        placements = [(s, assignment[s.index][0], assignment[s.index][1]) for s in sessions]
+        return SolveResult(status, placements, report)
+
+    hardest = sorted(range(len(sessions)), key=lambda j: -wipeouts[j])[:5]
+    report["most_constrained"] = [
+        {"session": sessions[j].describe(), "wipeouts": wipeouts[j]} for j in hardest if wipeouts[j]
+    ]
+    if status == "timeout":
+        report["reasons"] = [f"search stopped after {stats['nodes']} nodes without a complete schedule"]
+    else:
+        report["reasons"] = ["every combination of placements was tried; the constraints cannot all be met"]
+    return SolveResult(status, [], report)
+
+
+def apply_solution(grid, result):
+    for s, day, p in result.placements:
+        for cell in grid.cells[day][p:p + s.length]:
+            grid.assign(cell, s.teacher, s.code, s.is_lab)
@@ -0,0 +1,190 @@
+import os
+import re
+import threading
+import time
+from flask import g, has_request_context, request
+
+# Optional per-response X-Query-Count / X-DB-Time headers
+SQL_METRICS_HEADERS = os.environ.get("SQL_METRICS_HEADERS", "0") == "1"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250, 500, 1000)
+DML_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def fingerprint(sql):
+    """Normalise a statement so the same query shape aggregates regardless of section table or literals."""
+    sql = re.sub(r"'(?:[^'\\]|\\.)*'", "?", sql)
+    sql = re.sub(r"\b\w+_(routine|courses)\b", r"<section>_\1", sql)
+    sql = re.sub(r"\b\d+\b", "?", sql)
+    sql = sql.replace("%s", "?")
+    sql = re.sub(r"\s+", " ", sql).strip()
+    return sql
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class SqlMetrics:
+    """Per-process SQL statistics aggregated by Flask endpoint and statement fingerprint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statements = {}
+        self.latency = {}
+        self.queries_per_request = {}
+        self.db_time_per_request = {}
+
+    def record_statement(self, endpoint, sql, seconds):
+        key = (endpoint, fingerprint(sql))
+        with self._lock:
+            stats = self.statements.setdefault(key, {"count": 0, "seconds": 0.0, "rows": 0})
+            stats["count"] += 1
+            stats["seconds"] += seconds
+            self.latency.setdefault(endpoint, Histogram(LATENCY_BUCKETS)).observe(seconds)
+        return key
+
+    def record_rows(self, key, rows):
+        with self._lock:
+            if key in self.statements:
+                self.statements[key]["rows"] += rows
+
+    def record_request(self, endpoint, queries, seconds):
+        with self._lock:
+            self.queries_per_request.setdefault(endpoint, Histogram(QUERY_COUNT_BUCKETS)).observe(queries)
+            self.db_time_per_request.setdefault(endpoint, Histogram(LATENCY_BUCKETS)).observe(seconds)
+
+    def render_prometheus(self):
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP hh_sql_statements_total SQL statements executed, by endpoint and fingerprint.",
+                "# TYPE hh_sql_statements_total counter",
+            ]
+            for (endpoint, fp), stats in sorted(self.statements.items()):
+                lines.append(f"hh_sql_statements_total{labels(endpoint=endpoint, fingerprint=fp)} {stats['count']}")
+            lines += [
+                "# HELP hh_sql_statement_seconds_total Time spent in SQL statements, by endpoint and fingerprint.",
+                "# TYPE hh_sql_statement_seconds_total counter",
+            ]
+            for (endpoint, fp), stats in sorted(self.statements.items()):
+                lines.append(f"hh_sql_statement_seconds_total{labels(endpoint=endpoint, fingerprint=fp)} "
+                             f"{stats['seconds']:.6f}")
+            lines += [
+                "# HELP hh_sql_rows_total Rows fetched or affected, by endpoint and fingerprint.",
+                "# TYPE hh_sql_rows_total counter",
+            ]
+            for (endpoint, fp), stats in sorted(self.statements.items()):
+                lines.append(f"hh_sql_rows_total{labels(endpoint=endpoint, fingerprint=fp)} {stats['rows']}")
+            lines += histogram_lines("hh_sql_latency_seconds", "Latency of single SQL statements.", self.latency)
+            lines += histogram_lines("hh_sql_queries_per_request", "SQL statements issued per request.",
+                                     self.queries_per_request)
+            lines += histogram_lines("hh_sql_time_per_request_seconds", "Total SQL time per request.",
+                                     self.db_time_per_request)
+        return "\n".join(lines) + "\n"
+
+
+def labels(**values):
+    def escape(v):
+        return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in values.items()) + "}"
+
+
+def histogram_lines(name, help_text, histograms):
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for endpoint, h in sorted(histograms.items()):
+        for bound, count in zip(h.buckets, h.counts):
+            lines.append(f"{name}_bucket{labels(endpoint=endpoint, le=bound)} {count}")
+        lines.append(f"{name}_bucket{labels(endpoint=endpoint, le='+Inf')} {h.count}")
+        lines.append(f"{name}_sum{labels(endpoint=endpoint)} {h.sum:.6f}")
+        lines.append(f"{name}_count{labels(endpoint=endpoint)} {h.count}")
+    return lines
+
+
+sql_metrics = SqlMetrics()
+
+
+def current_endpoint():
+    if has_request_context():
+        return request.endpoint or "<unmatched>"
+    return "<none>"
+
+
+class InstrumentedCursor:
+    """Cursor proxy that times every execute and attributes it to the current Flask endpoint."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._key = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _timed(self, method, sql, args):
+        t0 = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._key = sql_metrics.record_statement(current_endpoint(), sql, elapsed)
+            if has_request_context():
+                g._sql_count = g.get("_sql_count", 0) + 1
+                g._sql_time = g.get("_sql_time", 0.0) + elapsed
+            if self._key[1].startswith(DML_PREFIXES):
+                rowcount = getattr(self._cursor, "rowcount", -1)
+                if rowcount is not None and rowcount > 0:
+                    sql_metrics.record_rows(self._key, rowcount)
+
+    def execute(self, sql, *args, **kwargs):
+        return self._timed(lambda s, *a: self._cursor.execute(s, *a, **kwargs), sql, args)
+
+    def executemany(self, sql, *args, **kwargs):
+        return self._timed(lambda s, *a: self._cursor.executemany(s, *a, **kwargs), sql, args)
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        # DML rowcount is recorded at execute time; SELECT rows are counted as they are fetched
+        if self._key is not None and not self._key[1].startswith(DML_PREFIXES):
+            sql_metrics.record_rows(self._key, len(rows))
+        return rows
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        if rows and self._key is not None:
+            sql_metrics.record_rows(self._key, len(rows))
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None and self._key is not None:
+            sql_metrics.record_rows(self._key, 1)
+        return row
+
+
+def init_sql_metrics(app):
+    app.config.setdefault("SQL_METRICS_HEADERS", SQL_METRICS_HEADERS)
+
+    @app.after_request
+    def record_request_sql(response):
+        queries = g.get("_sql_count", 0)
+        seconds = g.get("_sql_time", 0.0)
+        sql_metrics.record_request(current_endpoint(), queries, seconds)
+        if app.config["SQL_METRICS_HEADERS"]:
+            response.headers["X-Query-Count"] = str(queries)
+            response.headers["X-DB-Time"] = f"{seconds * 1000:.3f}ms"
+        return response
@@ -0,0 +1,224 @@
+import re
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import datetime, time, timedelta
+
+
+# ---- Time values: MySQL returns TIME as timedelta, other drivers as datetime.time ----
+# (or, from SQLite tables created before the MYSQL_TIME column type, as "HH:MM:SS" text)
+
+def time_value_to_minutes(value):
+    """Minutes since midnight for a TIME value from any backend."""
+    if isinstance(value, str):
+        value = time.fromisoformat(value)
+    if isinstance(value, timedelta):
+        return int(value.total_seconds() // 60)
+    elif isinstance(value, (time, datetime)):
+        return value.hour * 60 + value.minute
+    return 0
+
+
+def time_value_to_time(value):
+    """datetime.time for a TIME value from any backend."""
+    if isinstance(value, str):
+        return time.fromisoformat(value)
+    if isinstance(value, timedelta):
+        return (datetime.min + value).time()
+    if isinstance(value, datetime):
+        return value.time()
+    return value
+
+
+class StorageBackend(ABC):
+    """What db.py needs from a database driver: connections, liveness checks and its error types."""
+
+    name = None
+    # Exception types raised by the driver; IntegrityError covers duplicate-key inserts
+    Error = Exception
+    IntegrityError = Exception
+
+    @abstractmethod
+    def connect(self):
+        """A new raw connection with the mysql.connector interface (cursor/commit/rollback/close)."""
+
+    @abstractmethod
+    def is_alive(self, raw):
+        """Whether a pooled raw connection can still be used."""
+
+    @abstractmethod
+    def ensure_index(self, cur, table, name, columns):
+        """Create an index unless it already exists."""
+
+
+class MySQLBackend(StorageBackend):
+    name = "mysql"
+
+    def __init__(self, host, database, user, password, port):
+        from mysql.connector import Error, IntegrityError
+        self.Error = Error
+        self.IntegrityError = IntegrityError
+        self.config = dict(host=host, database=database, user=user, password=password, port=int(port))
+
+    def connect(self):
+        import mysql.connector
+        return mysql.connector.connect(**self.config)
+
+    def is_alive(self, raw):
+        return raw.is_connected()
+
+    def ensure_index(self, cur, table, name, columns):
+        # MySQL has no CREATE INDEX IF NOT EXISTS
+        cur.execute("""
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        """, (table, name))
+        if cur.fetchone()[0] == 0:
+            cur.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+
+
+# ---- Embedded SQLite backend speaking the MySQL dialect the routes use ----
+
+# TIME / DATETIME columns are declared under these names in SQLite so the converters
+# below only fire for tables this backend created, never for other sqlite3 users
+SQLITE_TIME_TYPE = "MYSQL_TIME"
+SQLITE_DATETIME_TYPE = "MYSQL_DATETIME"
+
+
+def _time_text(seconds):
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def adapt_param(value):
+    """Store time values as MySQL writes them; done per statement instead of via sqlite3.register_adapter."""
+    if isinstance(value, timedelta):
+        return _time_text(int(value.total_seconds()))
+    if isinstance(value, datetime):
+        return value.isoformat(" ")
+    if isinstance(value, time):
+        return value.strftime("%H:%M:%S")
+    return value
+
+
+def _convert_time(raw):
+    # Match MySQL, which hands TIME columns back as timedelta
+    h, m, s = raw.decode().split(":")
+    return timedelta(hours=int(h), minutes=int(m), seconds=float(s))
+
+
+sqlite3.register_converter(SQLITE_TIME_TYPE, _convert_time)
+sqlite3.register_converter(SQLITE_DATETIME_TYPE, lambda raw: datetime.fromisoformat(raw.decode()))
+
+
+def translate_mysql(sql):
+    """Rewrite the MySQL-specific bits of a statement for SQLite.
+
+    This is a textual rewrite, not a parser, and covers exactly the dialect the
+    app sends (tests/test_storage.py pins each case):
+
+    - %s placeholders
+    - SHOW TABLES, as the whole statement
+    - SERIAL PRIMARY KEY and INT AUTO_INCREMENT PRIMARY KEY
+    - TIME and DATETIME column types in CREATE TABLE
+    - INSERT ... ON DUPLICATE KEY UPDATE col = VALUES(col), against the
+      table's primary key or a UNIQUE constraint
+
+    Everything else (LIMIT, IF NOT EXISTS, TRUE/FALSE, COUNT/GROUP BY, ...) is
+    already valid in both. Other MySQL-only syntax passes through unchanged
+    and fails in SQLite, so new statements must stay inside this subset.
+    """
+    if sql.strip().upper() == "SHOW TABLES":
+        return "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"
+    sql = sql.replace("%s", "?")
+    if sql.lstrip().upper().startswith("CREATE TABLE"):
+        sql = re.sub(r"\bSERIAL PRIMARY KEY\b|\bINT AUTO_INCREMENT PRIMARY KEY\b",
+                     "INTEGER PRIMARY KEY AUTOINCREMENT", sql)
+        sql = re.sub(r"\bDATETIME\b", SQLITE_DATETIME_TYPE, sql)
+        sql = re.sub(r"\bTIME\b", SQLITE_TIME_TYPE, sql)
+    sql = sql.replace("ON DUPLICATE KEY UPDATE", "ON CONFLICT DO UPDATE SET")
+    sql = re.sub(r"VALUES\((\w+)\)", r"excluded.\1", sql)
+    return sql
+
+
+class SQLiteCursor:
+    def __init__(self, raw):
+        self._cur = raw.cursor()
+
+    def execute(self, sql, params=()):
+        self._cur.execute(translate_mysql(sql), tuple(adapt_param(v) for v in params))
+
+    def executemany(self, sql, seq):
+        self._cur.executemany(translate_mysql(sql), [tuple(adapt_param(v) for v in row) for row in seq])
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def fetchmany(self, size=1):
+        return self._cur.fetchmany(size)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    def close(self):
+        self._cur.close()
+
+
+class SQLiteConnection:
+    """mysql.connector-shaped wrapper around an sqlite3 connection."""
+
+    def __init__(self, path=":memory:"):
+        uri = path.startswith("file:")
+        self._raw = sqlite3.connect(path, uri=uri, check_same_thread=False,
+                                    detect_types=sqlite3.PARSE_DECLTYPES)
+
+    def cursor(self, *args, **kwargs):
+        return SQLiteCursor(self._raw)
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def is_connected(self):
+        try:
+            self._raw.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def close(self):
+        self._raw.close()
+
+
+class SQLiteBackend(StorageBackend):
+    """Embedded backend for single-node deployments, tests and benchmarks.
+
+    path=":memory:" gives one in-memory database shared by every pooled
+    connection in the process.
+    """
+
+    name = "sqlite"
+    Error = sqlite3.Error
+    IntegrityError = sqlite3.IntegrityError
+
+    def __init__(self, path=":memory:"):
+        if path == ":memory:":
+            path = f"file:hackheritage_{id(self):x}?mode=memory&cache=shared"
+        self.path = path
+        self._keepalive = SQLiteConnection(path) if "mode=memory" in path else None
+
+    def connect(self):
+        return SQLiteConnection(self.path)
+
+    def is_alive(self, raw):
+        return raw.is_connected()
+
+    def ensure_index(self, cur, table, name, columns):
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
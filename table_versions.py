@@ -0,0 +1,49 @@
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Content versions live in small files so every gunicorn worker on the box sees the same value
+VERSION_DIR = os.environ.get("TABLE_VERSION_DIR", os.path.join(tempfile.gettempdir(), "hackheritage_versions"))
+
+# Called with the table name after every bump in this process (e.g. to drop cached reads)
+_bump_listeners = []
+
+
+def on_table_bump(callback):
+    _bump_listeners.append(callback)
+
+
+def _version_path(table):
+    return os.path.join(VERSION_DIR, f"{table}.version")
+
+
+def table_version(table):
+    """Current content version of a table ("0" if it has never been written through the app)."""
+    try:
+        with open(_version_path(table)) as f:
+            return f.read().strip() or "0"
+    except OSError:
+        return "0"
+
+
+def table_modified_at(table):
+    """UTC time of the last bump, to whole seconds like HTTP dates; None if never written."""
+    try:
+        mtime = os.path.getmtime(_version_path(table))
+    except OSError:
+        return None
+    return datetime.fromtimestamp(int(mtime), tz=timezone.utc)
+
+
+def bump_table_version(table):
+    """Record that a table's content changed; call after the write commits."""
+    os.makedirs(VERSION_DIR, exist_ok=True)
+    version = f"{time.time_ns():x}-{os.getpid():x}"
+    tmp_path = f"{_version_path(table)}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, _version_path(table))
+    for callback in _bump_listeners:
+        callback(table)
+    return version
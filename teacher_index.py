@@ -0,0 +1,50 @@
+import logging
+from db import get_backend
+from schema import ensure_schema, ensure_section, sync_section_routine
+from routine_view import build_view, format_time_range
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_teacher_index(conn, routine_table):
+    """Re-copy one section's routine into the indexed `assignments` table.
+
+    Call after the routine write has committed; it runs in its own
+    transaction so a failure here never rolls back the timetable itself.
+    A failure is logged and reported as False; the next refresh repairs it.
+    """
+    cur = conn.cursor()
+    try:
+        ensure_schema(cur, get_backend())
+        prefix = routine_table[:-len("_routine")]
+        sync_section_routine(cur, ensure_section(cur, prefix), routine_table)
+        conn.commit()
+        return True
+    except Exception:
+        logger.exception("Teacher index refresh for %s failed", routine_table)
+        conn.rollback()
+        return False
+    finally:
+        cur.close()
+
+
+def load_teacher_sessions(cur, teacher):
+    """All of a teacher's assigned slots across sections in one read on idx_assignments_teacher_day."""
+    ensure_schema(cur, get_backend())
+    cur.execute("""
+        SELECT s.table_prefix, a.day, a.slot_start, a.slot_end, a.course_code, a.is_lab, a.classroom
+        FROM assignments a
+        JOIN sections s ON s.id = a.section_id
+        WHERE a.teacher_name = %s
+        ORDER BY a.day, a.slot_start
+    """, (teacher,))
+    return cur.fetchall()
+
+
+def load_teacher_view(cur, teacher):
+    """RoutineView of one teacher's week; cells are (section, code, is_lab, classroom)."""
+    entries = [
+        (day, format_time_range(start, end), (prefix, code, bool(is_lab), classroom))
+        for prefix, day, start, end, code, is_lab, classroom in load_teacher_sessions(cur, teacher)
+    ]
+    return build_view(entries)
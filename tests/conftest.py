@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+
+# Tests run against the embedded SQLite backend with their own table versions; read at import time
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("TABLE_VERSION_DIR", tempfile.mkdtemp(prefix="hackheritage-test-versions-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from routine_grid import RoutineGrid, build_day_template, build_slot_rows, write_grid
+
+WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+
+def make_grid(days=WEEK, start="09:00", end="17:00", slot=60, break_start="13:00", break_end="14:00"):
+    """An empty RoutineGrid as /time-slots would have created it."""
+    template = build_day_template(start, end, slot, break_start, break_end)
+    return RoutineGrid([
+        (day, slot_start, slot_end, label, None, None, False, None)
+        for day, label, slot_start, slot_end in build_slot_rows(days, template)
+    ])
+
+
+def sessions(grid):
+    """(day, teacher, code, is_lab, [cell starts]) for each run of back-to-back cells of one session."""
+    found = []
+    for day in grid.days:
+        previous = None
+        for cell in grid.cells[day]:
+            key = None if cell["teacher"] is None else (cell["teacher"], cell["code"], cell["is_lab"])
+            if key is not None and key == previous and found[-1][4][-1] + (cell["end"] - cell["start"]) == cell["start"]:
+                found[-1][4].append(cell["start"])
+            elif key is not None:
+                found.append((day,) + key + ([cell["start"]],))
+            previous = key
+    return found
+
+
+def store_routine(routine_table, grid):
+    """Create a routine table holding grid (as loaded: every cell counts as changed) and bump its version."""
+    from db import get_db_connection
+    from table_versions import bump_table_version
+    grid._stored = {}
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute(f"DROP TABLE IF EXISTS {routine_table}")
+    cur.execute(f"""
+        CREATE TABLE {routine_table} (
+            day VARCHAR(20),
+            time_slot VARCHAR(100),
+            slot_start TIME,
+            slot_end TIME,
+            teacher_name VARCHAR(100) DEFAULT NULL,
+            course_code VARCHAR(50) DEFAULT NULL,
+            is_lab BOOLEAN DEFAULT FALSE,
+            classroom VARCHAR(20) DEFAULT NULL,
+            PRIMARY KEY (day, slot_start)
+        )
+    """)
+    write_grid(cur, routine_table, grid)
+    conn.commit()
+    cur.close()
+    conn.close()
+    bump_table_version(routine_table)
+
+
+@pytest.fixture
+def client():
+    from app1 import app
+    return app.test_client()
+
+
+@pytest.fixture
+def grid():
+    return make_grid()
@@ -0,0 +1,69 @@
+from batch_scheduler import schedule_component, teacher_components
+from conftest import make_grid, sessions
+
+NO_BREAK = dict(break_start="08:00", break_end="08:00")
+
+
+def section(name, grid, labs=(), tutorials=()):
+    return {"routine_table": f"{name}_routine", "grid": grid, "labs": list(labs), "tutorials": list(tutorials)}
+
+
+def teacher_slots(grid, teacher):
+    return {(day, start) for day, t, _, _, starts in sessions(grid) if t == teacher for start in starts}
+
+
+def test_sections_sharing_a_teacher_are_not_double_booked():
+    sections = [
+        section(name, make_grid(days=["Monday"], start="09:00", end="12:00", **NO_BREAK),
+                tutorials=[("A", f"{name}1", "1 hour", 1, False), (f"T{name}", f"{name}2", "1 hour", 1, False)])
+        for name in ("x", "y", "z")
+    ]
+    assert len(teacher_components(sections)) == 1
+
+    results = schedule_component(sections, {}, seed=0, time_limit=2.0)
+
+    assert [r["status"] for r in results] == ["complete"] * 3
+    booked = [teacher_slots(r["grid"], "A") for r in results]
+    assert all(len(slots) == 1 for slots in booked)
+    assert len(set().union(*booked)) == 3
+
+
+def test_fixed_occupancy_is_respected():
+    grid = make_grid(days=["Monday"], start="09:00", end="11:00", **NO_BREAK)
+    results = schedule_component([section("x", grid, tutorials=[("A", "M1", "1 hour", 1, False)])],
+                                 {"A": {"Monday": [(9 * 60, 10 * 60)]}}, seed=0, time_limit=2.0)
+
+    assert results[0]["status"] == "complete"
+    assert teacher_slots(results[0]["grid"], "A") == {("Monday", 10 * 60)}
+
+
+def test_failed_section_keeps_its_stored_slots_busy():
+    # x still holds A at 09:00 in its table, but its new course list cannot be scheduled
+    held = make_grid(days=["Monday"], start="09:00", end="11:00", **NO_BREAK)
+    held.assign(held.cells["Monday"][0], "A", "M1", False)
+    failing = section("x", held, labs=[("B", "P1", "3 hours", 1, True)], tutorials=[("A", "M1", "1 hour", 1, False)])
+    # y can only use 09:00
+    other = section("y", make_grid(days=["Monday"], start="09:00", end="10:00", **NO_BREAK),
+                    tutorials=[("A", "M2", "1 hour", 1, False)])
+
+    results = {r["routine_table"]: r for r in schedule_component([failing, other], {}, seed=0, time_limit=2.0)}
+
+    assert results["x_routine"]["grid"] is None
+    assert results["y_routine"]["status"] != "complete"
+    assert results["y_routine"]["grid"] is None
+
+
+def test_batch_route_caps_the_worker_count(client, monkeypatch):
+    import routes_assign_courses
+    requested = []
+
+    def fake_run_batch(conn, seed, time_limit, workers):
+        requested.append(workers)
+        return {"components": 0, "sections": []}
+
+    monkeypatch.setattr(routes_assign_courses, "run_batch", fake_run_batch)
+    monkeypatch.setattr(routes_assign_courses, "BATCH_WORKERS", 4)
+
+    for workers in ("1000", "2", "0", "-3", "many"):
+        client.get(f"/assign-courses/batch?workers={workers}")
+    assert requested == [4, 2, 1, 1, 4]
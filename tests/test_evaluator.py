@@ -0,0 +1,44 @@
+from evaluator import evaluate
+from conftest import make_grid
+
+
+def book(grid, day, start, length, teacher, code, is_lab):
+    cells = [c for c in grid.cells[day] if c["start"] >= start][:length]
+    for cell in cells:
+        assert not cell["is_break"]
+        grid.assign(cell, teacher, code, is_lab)
+
+
+def half_hour_grid():
+    # 11:00-12:00 break covers two 30-minute slots
+    return make_grid(days=["Monday"], start="09:00", end="14:00", slot=30, break_start="11:00", break_end="12:00")
+
+
+def test_lab_right_after_a_multi_slot_break_counts_as_first_after_break():
+    grid = half_hour_grid()
+    book(grid, "Monday", 12 * 60, 2, "A", "M1", True)
+
+    metrics = evaluate([grid])
+    assert metrics["labs_first_after_break"] == 1
+    assert metrics["labs_before_break"] == 0
+    assert metrics["labs_after_break"] == 1
+
+
+def test_labs_are_split_around_the_whole_break():
+    grid = half_hour_grid()
+    book(grid, "Monday", 9 * 60, 2, "A", "M1", True)
+    book(grid, "Monday", 12 * 60 + 30, 2, "B", "P1", True)
+
+    metrics = evaluate([grid])
+    assert metrics["labs_before_break"] == 1
+    assert metrics["labs_after_break"] == 1
+    assert metrics["lab_split_deviation"] == 0
+    assert metrics["labs_first_after_break"] == 0
+
+
+def test_teacher_clash_across_sections():
+    first, second = make_grid(days=["Monday"]), make_grid(days=["Monday"])
+    book(first, "Monday", 9 * 60, 1, "A", "M1", False)
+    book(second, "Monday", 9 * 60, 1, "A", "M2", False)
+
+    assert evaluate([first, second])["teacher_clashes"] == 1
@@ -0,0 +1,110 @@
+import io
+import json
+import pytest
+import routes_import_courses
+from db import get_db_connection
+
+HEADER = "teacher_name,course_name,course_code,tutorial_time,lab_time,tutorials_per_week,labs_per_week\n"
+
+
+@pytest.fixture
+def courses_table(client):
+    client.post("/", data=dict(branch="IMP", semester="1", year="2025"))
+    with client.session_transaction() as session:
+        table = session["courses_table"]
+    run(f"DELETE FROM {table}")
+    return table
+
+
+def run(sql, params=()):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    rows = cur.fetchall() if sql.lstrip().upper().startswith("SELECT") else None
+    conn.commit()
+    cur.close()
+    conn.close()
+    return rows
+
+
+def upload(client, body, filename="courses.csv"):
+    return client.post("/import-courses", data={"file": (io.BytesIO(body.encode()), filename)},
+                       content_type="multipart/form-data")
+
+
+def codes(table):
+    return [row[0] for row in run(f"SELECT course_code FROM {table} ORDER BY id")]
+
+
+def test_invalid_rows_are_reported_and_the_rest_inserted(client, courses_table):
+    body = HEADER + "\n".join([
+        "A,Maths,M1,1 hour,2 hours,2,1",
+        ",Physics,P1,1 hour,,1,0",
+        "B,Physics,P2,an hour,,1,0",
+        "C,Chem," + "X" * 51 + ",1 hour,,1,0",
+        "D" * 101 + ",Bio,B1,1 hour,,1,0",
+        "E,Lab,L1,,3 hours,0,1",
+    ])
+    result = upload(client, body).json
+
+    assert (result["rows"], result["inserted"], result["rejected"]) == (6, 2, 4)
+    assert [e["row"] for e in result["errors"]] == [2, 3, 4, 5]
+    assert "course_code is longer than 50" in result["errors"][2]["error"]
+    assert codes(courses_table) == ["M1", "L1"]
+
+
+def test_database_rejections_only_drop_the_offending_rows(client, courses_table, monkeypatch):
+    monkeypatch.setattr(routes_import_courses, "IMPORT_BATCH_SIZE", 3)
+    run(f"CREATE UNIQUE INDEX uq_{courses_table}_code ON {courses_table} (course_code)")
+    try:
+        rows = [f"T{i},Course,C{i % 5},1 hour,,1,0" for i in range(8)]
+        result = upload(client, HEADER + "\n".join(rows)).json
+    finally:
+        run(f"DROP INDEX uq_{courses_table}_code")
+
+    assert (result["inserted"], result["rejected"]) == (5, 3)
+    assert [e["row"] for e in result["errors"]] == [6, 7, 8]
+    assert all("rejected by the database" in e["error"] for e in result["errors"])
+    assert codes(courses_table) == ["C0", "C1", "C2", "C3", "C4"]
+
+
+@pytest.mark.parametrize("count", [4, 5, 6])
+def test_chunk_boundaries(client, courses_table, monkeypatch, count):
+    monkeypatch.setattr(routes_import_courses, "IMPORT_BATCH_SIZE", 5)
+    rows = [f"T{i},Course,C{i},1 hour,,1,0" for i in range(count)]
+
+    result = upload(client, HEADER + "\n".join(rows)).json
+    assert (result["rows"], result["inserted"], result["rejected"]) == (count, count, 0)
+    assert codes(courses_table) == [f"C{i}" for i in range(count)]
+
+
+def test_json_lines_and_array_match_csv(client, courses_table):
+    rows = [dict(teacher_name="A", course_name="Maths", course_code="M1", tutorial_time="1 hour",
+                 lab_time="2 hours", tutorials_per_week=2, labs_per_week=1),
+            dict(teacher_name="B", course_name="Physics", course_code="P1", tutorial_time="1 hour",
+                 tutorials_per_week="3")]
+    csv_body = HEADER + "A,Maths,M1,1 hour,2 hours,2,1\nB,Physics,P1,1 hour,,3,0\n"
+
+    results = [
+        upload(client, csv_body).json,
+        upload(client, "\n".join(json.dumps(r) for r in rows), "courses.jsonl").json,
+        upload(client, json.dumps(rows, indent=2), "courses.json").json,
+    ]
+
+    assert all(r["inserted"] == 2 and r["rejected"] == 0 for r in results)
+    stored = run(f"SELECT teacher_name, course_code, tutorial_time, lab_time, tutorials_per_week, labs_per_week "
+                 f"FROM {courses_table} ORDER BY id")
+    assert stored[0:2] == stored[2:4] == stored[4:6]
+
+
+def test_unreadable_file_is_rejected_without_keeping_rows(client, courses_table):
+    result = upload(client, '{"teacher_name": "A", "course_name": "M", "course_code": "M1"}\n{"teacher',
+                    "courses.jsonl")
+
+    assert result.status_code == 400
+    assert "could not parse" in result.json["error"]
+    assert codes(courses_table) == []
+
+
+def test_missing_file_is_a_400(client, courses_table):
+    assert client.post("/import-courses").status_code == 400
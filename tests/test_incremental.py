@@ -0,0 +1,100 @@
+import random
+import pytest
+from incremental import reschedule_incremental, wanted_sessions, MAX_REPAIR_MOVES
+from routine_grid import place_courses
+from conftest import make_grid, sessions
+
+LABS = [("A", "M1", "2 hours", 1, True), ("C", "L1", "3 hours", 1, True)]
+TUTORIALS = [("A", "M1", "1 hour", 2, False), ("B", "P1", "1 hour", 3, False)]
+
+
+@pytest.fixture
+def scheduled(grid):
+    random.seed(3)
+    assert place_courses(grid, LABS, 60) + place_courses(grid, TUTORIALS, 60, even_distribution=True) == []
+    return grid
+
+
+def test_existing_placements_stay_put_when_a_course_is_added(scheduled):
+    before = sessions(scheduled)
+
+    result = reschedule_incremental(scheduled, LABS + [("D", "E1", "2 hours", 1, True)],
+                                    TUTORIALS + [("D", "E1", "1 hour", 2, False)])
+
+    after = sessions(scheduled)
+    assert all(s in after for s in before)
+    assert sorted((t, lab) for _, t, _, lab, _ in after if (t, lab) not in
+                  {(t2, lab2) for _, t2, _, lab2, _ in before}) == [("D", False), ("D", False), ("D", True)]
+    assert (result["kept"], result["added"], result["removed"], result["unplaced"]) == (7, 3, 0, [])
+
+
+def test_removed_courses_are_dropped_and_the_rest_kept(scheduled):
+    before = sessions(scheduled)
+
+    result = reschedule_incremental(scheduled, LABS, [("A", "M1", "1 hour", 2, False)])
+
+    after = sessions(scheduled)
+    assert after == [s for s in before if s[1] != "B"]
+    assert result["removed"] == 3
+
+
+def test_fewer_sessions_per_week_frees_the_surplus(scheduled):
+    reschedule_incremental(scheduled, LABS, [("A", "M1", "1 hour", 2, False), ("B", "P1", "1 hour", 1, False)])
+
+    assert sum(1 for s in sessions(scheduled) if s[1] == "B") == 1
+
+
+def fragmented_grid():
+    """Three days of four slots where every other slot holds a one-hour tutorial of its own teacher."""
+    grid = make_grid(days=["Monday", "Tuesday", "Wednesday"], start="09:00", end="13:00",
+                     break_start="08:00", break_end="08:00")
+    tutorials = []
+    for day in grid.days:
+        for cell in grid.cells[day][1::2]:
+            teacher = f"T{len(tutorials)}"
+            grid.assign(cell, teacher, f"C{len(tutorials)}", False)
+            tutorials.append((teacher, f"C{len(tutorials)}", "1 hour", 1, False))
+    return grid, tutorials
+
+
+@pytest.mark.parametrize("max_moves", [0, 1, 2, MAX_REPAIR_MOVES])
+def test_repair_moves_at_most_max_moves_sessions(max_moves):
+    grid, tutorials = fragmented_grid()
+    before = sessions(grid)
+
+    result = reschedule_incremental(grid, [("A", "L1", "2 hours", 3, True)], tutorials, max_moves=max_moves)
+
+    after = sessions(grid)
+    moved = [s for s in before if s not in after]
+    labs = [s for s in after if s[3]]
+    assert len(moved) == result["repaired"] <= max_moves
+    assert len(labs) == result["repaired"]
+    assert all(len(s[4]) == 2 for s in labs)
+    assert result["unplaced"] == ([("A", "L1", 3 - result["repaired"], True)] if result["repaired"] < 3 else [])
+    assert sorted(s[1] for s in after if not s[3]) == sorted(t for t, *_ in tutorials)
+
+
+def test_repair_uses_its_budget_when_it_can():
+    grid, tutorials = fragmented_grid()
+
+    result = reschedule_incremental(grid, [("A", "L1", "2 hours", 1, True)], tutorials, max_moves=1)
+    assert result["repaired"] == 1 and result["unplaced"] == []
+
+
+def test_duplicate_course_rows():
+    wanted, conflicts = wanted_sessions([
+        ("A", "M1", "1 hour", 2, False),
+        ("A", "M1", "1 hour", 1, False),
+        ("A", "M1", "2 hours", 1, False),
+    ], 60)
+
+    assert wanted == {("A", "M1", False): ["1 hour", 1, 3]}
+    assert conflicts == [("A", "M1", 1, False)]
+
+
+def test_conflicting_duplicate_is_reported_not_placed(scheduled):
+    result = reschedule_incremental(scheduled, LABS, TUTORIALS + [("B", "P1", "2 hours", 1, False)])
+
+    assert result["conflicting_rows"] == 1
+    assert ("B", "P1", 1, False) in result["unplaced"]
+    assert sum(1 for s in sessions(scheduled) if s[1] == "B") == 3
@@ -0,0 +1,54 @@
+import jobs
+from db import get_db_connection
+
+
+def job_row(job_id):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT status, active_table FROM schedule_jobs WHERE id = %s", (job_id,))
+    row = cur.fetchone()
+    cur.close()
+    conn.close()
+    return row
+
+
+def test_create_job_returns_the_active_job_instead_of_a_second_one():
+    job_id, created = jobs.create_job("dedupe_routine")
+    assert created
+
+    assert jobs.create_job("dedupe_routine") == (job_id, False)
+
+
+def test_create_job_gives_up_cleanly_when_the_slot_keeps_changing_hands(monkeypatch):
+    jobs.create_job("race_routine")
+    # Every check misses the holder, so every insert hits the UNIQUE active_table
+    monkeypatch.setattr(jobs, "active_job", lambda cur, table: None)
+
+    assert jobs.create_job("race_routine") == (None, False)
+
+
+def test_submit_route_answers_409_when_no_job_could_be_queued(monkeypatch):
+    from app1 import app
+    monkeypatch.setattr("routes_assign_courses.submit_schedule_job", lambda *args, **kwargs: (None, False))
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["routine_table"] = "race_routine"
+        session["courses_table"] = "race_courses"
+
+    response = client.post("/assign-courses/jobs")
+    assert response.status_code == 409
+    assert "status_url" not in response.json
+
+
+class BrokenConnection:
+    def rollback(self):
+        raise ConnectionError("server has gone away")
+
+
+def test_failure_is_recorded_on_a_new_connection_when_the_job_connection_is_broken():
+    job_id, _ = jobs.create_job("broken_routine")
+
+    jobs.mark_failed(BrokenConnection(), None, job_id, RuntimeError("boom"))
+
+    assert job_row(job_id) == ("failed", None)
+    assert jobs.create_job("broken_routine")[1]
@@ -0,0 +1,91 @@
+from datetime import timedelta
+import pytest
+from db import get_db_connection
+from migrate_schema import migrate
+from conftest import make_grid, store_routine
+
+PREFIX = "mig_3_2025"
+
+
+def query(sql, params=()):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    rows = cur.fetchall()
+    cur.close()
+    conn.close()
+    return rows
+
+
+@pytest.fixture
+def legacy_section():
+    """A section as the app stores it: {prefix}_courses and {prefix}_routine dynamic tables."""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute(f"DROP TABLE IF EXISTS {PREFIX}_courses")
+    cur.execute(f"""
+        CREATE TABLE {PREFIX}_courses (
+            id SERIAL PRIMARY KEY,
+            teacher_name VARCHAR(100) NOT NULL,
+            course_name VARCHAR(100) NOT NULL,
+            course_code VARCHAR(50) NOT NULL,
+            tutorial_time VARCHAR(20) NULL,
+            lab_time VARCHAR(20) NULL,
+            tutorials_per_week INTEGER DEFAULT 0,
+            labs_per_week INTEGER DEFAULT 0
+        )
+    """)
+    cur.executemany(f"""
+        INSERT INTO {PREFIX}_courses (teacher_name, course_name, course_code, tutorial_time, lab_time, tutorials_per_week, labs_per_week)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """, [("A", "Maths", "M1", "1 hour", "2 hours", 1, 1), ("B", "Physics", "P1", "1 hour", None, 1, 0)])
+    conn.commit()
+    cur.close()
+    conn.close()
+
+    grid = make_grid(days=["Monday"], start="09:00", end="13:00", break_start="11:00", break_end="12:00")
+    monday = grid.cells["Monday"]
+    grid.assign(monday[0], "A", "M1", False)
+    monday[0]["classroom"] = "R1"
+    grid.assign(monday[3], "B", "P1", False)
+    store_routine(f"{PREFIX}_routine", grid)
+
+
+def migrated():
+    section = query("SELECT id, branch, semester, year FROM sections WHERE table_prefix = %s", (PREFIX,))
+    section_id = section[0][0]
+    return {
+        "section": section,
+        "courses": query("SELECT teacher_name, course_code, tutorial_time, lab_time, tutorials_per_week, labs_per_week "
+                         "FROM courses WHERE section_id = %s ORDER BY id", (section_id,)),
+        "slots": query("SELECT day, slot_start, is_break FROM slots WHERE section_id = %s ORDER BY slot_start",
+                       (section_id,)),
+        "assignments": query("SELECT day, slot_start, slot_end, teacher_name, course_code, is_lab, classroom "
+                             "FROM assignments WHERE section_id = %s ORDER BY slot_start", (section_id,)),
+    }
+
+
+def test_legacy_tables_are_copied_into_the_normalised_schema(legacy_section):
+    assert migrate([PREFIX]) == [(PREFIX, "ok")]
+
+    rows = migrated()
+    assert [row[1:] for row in rows["section"]] == [("mig", "3", "2025")]
+    assert rows["courses"] == [("A", "M1", "1 hour", "2 hours", 1, 1), ("B", "P1", "1 hour", None, 1, 0)]
+    assert [bool(row[2]) for row in rows["slots"]] == [False, False, True, False]
+    assert rows["assignments"] == [
+        ("Monday", timedelta(hours=9), timedelta(hours=10), "A", "M1", 0, "R1"),
+        ("Monday", timedelta(hours=12), timedelta(hours=13), "B", "P1", 0, None),
+    ]
+
+
+def test_migrating_twice_is_idempotent(legacy_section):
+    migrate([PREFIX])
+    first = migrated()
+
+    assert migrate([PREFIX]) == [(PREFIX, "ok")]
+    assert migrated() == first
+    assert len(query("SELECT id FROM sections WHERE table_prefix = %s", (PREFIX,))) == 1
+
+
+def test_only_selected_prefixes_are_migrated(legacy_section):
+    assert migrate(["nothing_1_2025"]) == []
@@ -0,0 +1,39 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import multistart
+from conftest import make_grid
+
+
+def test_only_queued_attempts_are_reported_as_cancelled(monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(multistart, "get_multistart_pool", lambda: pool)
+
+    def attempt(grid, labs, tutorials, seed):
+        if seed:
+            time.sleep(0.5)
+        return seed, {"unplaced": 0, "teacher_clustering": seed, "day_imbalance": 0}, make_grid(), "outcome"
+
+    monkeypatch.setattr(multistart, "run_attempt", attempt)
+    grid = make_grid()
+
+    # Seed 0 finishes at once; 1 and 2 are running at the deadline, 3 is still queued
+    outcome, report = multistart.best_of(grid, [], [], attempts=4, time_limit=0.1)
+    pool.shutdown(wait=True)
+
+    assert outcome == "outcome"
+    assert report["attempts"] == 1
+    assert report["best_seed"] == 0
+    assert report["cancelled"] == 1
+    assert report["abandoned_running"] == 2
+
+
+def test_best_scoring_attempt_is_adopted():
+    grid = make_grid(days=["Monday", "Tuesday"])
+    labs = [("A", "M1", "2 hours", 1, True)]
+    tutorials = [("A", "M1", "1 hour", 2, False), ("B", "P1", "1 hour", 2, False)]
+
+    outcome, report = multistart.best_of(grid, labs, tutorials, attempts=3, time_limit=30)
+
+    assert outcome.status == "complete"
+    assert report["attempts"] == 3 and report["cancelled"] == 0
+    assert report["score"] == multistart.score_grid(grid, 0)
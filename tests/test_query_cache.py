@@ -0,0 +1,114 @@
+import pytest
+import query_cache as qc
+from db import get_db_connection
+from query_cache import QueryCache, query_cache
+from routine_view import load_routine_view
+from table_versions import bump_table_version
+from conftest import make_grid, store_routine
+
+
+class CountingCursor:
+    def __init__(self, cur):
+        self.cur = cur
+        self.queries = 0
+
+    def execute(self, sql, params=()):
+        self.queries += 1
+        self.cur.execute(sql, params)
+
+    def fetchall(self):
+        return self.cur.fetchall()
+
+
+@pytest.fixture
+def cur():
+    conn = get_db_connection()
+    raw = conn.cursor()
+    raw.execute("DROP TABLE IF EXISTS qc_items")
+    raw.execute("CREATE TABLE qc_items (id INTEGER, name VARCHAR(20))")
+    raw.execute("INSERT INTO qc_items VALUES (1, 'one')")
+    conn.commit()
+    yield CountingCursor(raw)
+    raw.close()
+    conn.close()
+
+
+def select(cache, cur, where="1 = 1"):
+    return cache.fetch(cur, "qc_items", f"SELECT id, name FROM qc_items WHERE {where} ORDER BY id")
+
+
+def test_a_bump_sends_the_next_fetch_to_the_database(cur):
+    assert select(query_cache, cur) == [(1, "one")]
+    assert select(query_cache, cur) == [(1, "one")]
+    assert cur.queries == 1
+
+    cur.execute("INSERT INTO qc_items VALUES (2, 'two')")
+    bump_table_version("qc_items")
+
+    assert select(query_cache, cur) == [(1, "one"), (2, "two")]
+    assert cur.queries == 3
+    assert query_cache.stats()["invalidations"] >= 1
+
+
+def test_entries_past_their_ttl_are_refetched(cur, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(qc.time, "monotonic", lambda: now[0])
+    cache = QueryCache(ttl=60)
+
+    select(cache, cur)
+    now[0] += 59
+    select(cache, cur)
+    assert cur.queries == 1
+
+    now[0] += 2
+    select(cache, cur)
+    assert cur.queries == 2
+    assert cache.stats()["expired"] == 1
+
+
+def test_the_entry_cap_evicts_the_least_recently_used(cur):
+    cache = QueryCache(max_entries=2)
+    select(cache, cur, "id = 1")
+    select(cache, cur, "id = 2")
+    select(cache, cur, "id = 1")
+    select(cache, cur, "id = 3")
+    assert cur.queries == 3
+
+    select(cache, cur, "id = 1")
+    select(cache, cur, "id = 3")
+    assert cur.queries == 3
+    select(cache, cur, "id = 2")
+    assert cur.queries == 4
+    assert cache.stats()["evictions"] == 2
+
+
+def test_the_byte_cap_evicts_the_oldest(cur):
+    # Same one-row result under three keys, so every entry has the same size
+    cache = QueryCache()
+    select(cache, cur, "1 = 1")
+    size = cache.stats()["bytes"]
+    cache._lru.max_bytes = size * 2
+
+    select(cache, cur, "2 = 2")
+    select(cache, cur, "3 = 3")
+    assert cache.stats()["entries"] == 2
+    select(cache, cur, "1 = 1")
+    assert cur.queries == 4
+
+
+def test_routine_view_never_serves_rows_from_before_a_write():
+    grid = make_grid(days=["Monday"], start="09:00", end="11:00")
+    store_routine("qcview_routine", grid)
+    conn = get_db_connection()
+    cur = CountingCursor(conn.cursor())
+
+    assert load_routine_view(cur, "qcview_routine").cells["Monday"][0] == "Free"
+    load_routine_view(cur, "qcview_routine")
+    assert cur.queries == 2
+
+    grid.assign(grid.cells["Monday"][0], "A", "M1", False)
+    store_routine("qcview_routine", grid)
+
+    assert load_routine_view(cur, "qcview_routine").cells["Monday"][0][0] == "A"
+    assert cur.queries == 4
+    conn.close()
@@ -0,0 +1,35 @@
+from room_allocator import RoomOccupancy, allocate_rooms
+from conftest import make_grid
+
+
+def test_overlapping_seeded_intervals_block_the_whole_span():
+    occupancy = RoomOccupancy()
+    occupancy.add("R1", "Monday", 9 * 60, 12 * 60)
+    occupancy.add("R1", "Monday", 10 * 60, 10 * 60 + 30)
+
+    assert not occupancy.is_free("R1", "Monday", 11 * 60, 11 * 60 + 30)
+    assert occupancy.is_free("R1", "Monday", 12 * 60, 13 * 60)
+    assert occupancy.is_free("R1", "Tuesday", 11 * 60, 11 * 60 + 30)
+
+
+def test_added_intervals_are_merged():
+    occupancy = RoomOccupancy()
+    for start, end in [(600, 660), (540, 570), (560, 610), (700, 760), (660, 700)]:
+        occupancy.add("R1", "Monday", start, end)
+
+    assert occupancy._intervals[("R1", "Monday")] == [(540, 760)]
+    assert occupancy.is_free("R1", "Monday", 480, 540)
+    assert not occupancy.is_free("R1", "Monday", 759, 800)
+
+
+def test_rooms_are_not_double_booked_across_sections():
+    occupancy = RoomOccupancy()
+    grids = [make_grid(days=["Monday"], start="09:00", end="11:00", break_start="08:00", break_end="08:00")
+             for _ in range(3)]
+    for n, grid in enumerate(grids):
+        grid.assign(grid.cells["Monday"][0], f"T{n}", "C", False)
+
+    unassigned = [allocate_rooms(grid, ["R1", "R2"], [], occupancy) for grid in grids]
+
+    assert [grid.cells["Monday"][0]["classroom"] for grid in grids] == ["R1", "R2", None]
+    assert [len(u) for u in unassigned] == [0, 0, 1]
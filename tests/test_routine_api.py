@@ -0,0 +1,84 @@
+import gzip
+import json
+import msgpack
+import pytest
+from conftest import make_grid, store_routine
+
+URL = "/api/routine/apisec"
+
+
+@pytest.fixture(autouse=True)
+def section():
+    grid = make_grid(days=["Monday", "Tuesday"], start="09:00", end="12:00", break_start="10:00", break_end="11:00")
+    grid.assign(grid.cells["Monday"][0], "A", "M1", False)
+    grid.cells["Monday"][0]["classroom"] = "R1"
+    store_routine("apisec_routine", grid)
+
+
+def test_columnar_payload(client):
+    response = client.get(URL)
+
+    assert response.status_code == 200
+    data = response.json
+    assert data["days"] == ["Monday", "Tuesday"]
+    assert data["teachers"] == ["A"]
+    assert data["cells"]["teacher"] == [[0, -2, -1], [-1, -2, -1]]
+    assert data["cells"]["room"][0][0] == data["rooms"].index("R1")
+
+
+def test_fields_and_days_filter(client):
+    data = client.get(URL + "?fields=teacher&days=Tuesday").json
+
+    assert data["days"] == ["Tuesday"]
+    assert list(data["cells"]) == ["teacher"]
+    assert data["cells"]["teacher"] == [[-1, -2, -1]]
+
+
+def test_msgpack_is_negotiated_from_accept(client):
+    response = client.get(URL, headers={"Accept": "application/msgpack"})
+
+    assert response.mimetype == "application/msgpack"
+    assert msgpack.unpackb(response.data) == client.get(URL).json
+
+
+def test_each_format_and_encoding_has_its_own_etag(client):
+    variants = [
+        {},
+        {"Accept": "application/msgpack"},
+        {"Accept-Encoding": "gzip"},
+        {"Accept": "application/msgpack", "Accept-Encoding": "gzip"},
+    ]
+    etags = {client.get(URL, headers=headers).headers["ETag"] for headers in variants}
+    assert len(etags) == len(variants)
+
+
+def test_vary_is_set_on_full_and_not_modified_responses(client):
+    response = client.get(URL)
+    not_modified = client.get(URL, headers={"If-None-Match": response.headers["ETag"]})
+
+    assert not_modified.status_code == 304
+    for r in (response, not_modified):
+        assert {"Accept", "Accept-Encoding"} <= set(r.vary)
+
+
+def test_json_etag_does_not_validate_a_msgpack_request(client):
+    etag = client.get(URL).headers["ETag"]
+
+    response = client.get(URL, headers={"If-None-Match": etag, "Accept": "application/msgpack"})
+    assert response.status_code == 200
+    assert response.mimetype == "application/msgpack"
+
+
+def test_gzip_only_when_accepted(client):
+    store_routine("apisec_routine", make_grid())
+    plain = client.get(URL)
+    packed = client.get(URL, headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert packed.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(packed.data)) == plain.json
+
+
+def test_unknown_section(client):
+    assert client.get("/api/routine/missing").status_code == 404
+    assert client.get("/api/routine/a;b").status_code == 404
@@ -0,0 +1,60 @@
+import io
+import zipfile
+import pytest
+import routine_export
+from db import get_db_connection
+from routine_export import iter_export_zip, load_export_items
+from conftest import make_grid, store_routine
+
+
+@pytest.fixture
+def sections(monkeypatch):
+    first = make_grid(days=["Monday"], start="09:00", end="11:00", break_start="08:00", break_end="08:00")
+    first.assign(first.cells["Monday"][0], "Ada Lovelace", "M1", False)
+    first.assign(first.cells["Monday"][1], "Ada_Lovelace", "M2", False)
+    second = make_grid(days=["Tuesday"], start="09:00", end="11:00", break_start="08:00", break_end="08:00")
+    for cell in second.cells["Tuesday"]:
+        second.assign(cell, "Ada Lovelace", "L1", True)
+    store_routine("exp_1_2025_routine", first)
+    store_routine("exp_2_2025_routine", second)
+    monkeypatch.setattr(routine_export, "discover_sections", lambda cur: ["exp_1_2025", "exp_2_2025"])
+
+
+def items(**flags):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    found = load_export_items(cur, **flags)
+    cur.close()
+    conn.close()
+    return found
+
+
+def read_zip(data):
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.testzip() is None
+    return {name: archive.read(name) for name in archive.namelist()}
+
+
+EXPECTED = ["sections/exp_1_2025.pdf", "sections/exp_2_2025.pdf",
+            "teachers/Ada_Lovelace.pdf", "teachers/Ada_Lovelace_2.pdf"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_streamed_zip_reads_back_with_one_pdf_per_timetable(sections, workers):
+    progress = []
+    chunks = list(iter_export_zip(items(), workers=workers, progress=lambda done, total: progress.append(done)))
+
+    entries = read_zip(b"".join(chunks))
+    assert list(entries) == EXPECTED
+    assert all(pdf.startswith(b"%PDF") for pdf in entries.values())
+    assert progress == [1, 2, 3, 4]
+    assert len(chunks) > 1
+
+
+def test_export_route_streams_the_selected_timetables(client, sections):
+    response = client.get("/export/routines.zip?include=sections")
+
+    assert response.mimetype == "application/zip"
+    entries = read_zip(response.data)
+    assert list(entries) == EXPECTED[:2]
+    assert all(pdf.startswith(b"%PDF") for pdf in entries.values())
@@ -0,0 +1,120 @@
+import random
+from routine_grid import place_courses, day_assignments, apply_day
+from conftest import make_grid, sessions, store_routine
+
+LABS = [("A", "M1", "2 hours", 1, True), ("C", "L1", "3 hours", 1, True)]
+TUTORIALS = [("A", "M1", "1 hour", 2, False), ("B", "P1", "1 hour", 3, False)]
+
+
+def test_place_courses_books_every_session(grid):
+    random.seed(1)
+    unplaced = place_courses(grid, LABS, 60) + place_courses(grid, TUTORIALS, 60, even_distribution=True)
+
+    assert unplaced == []
+    placed = sessions(grid)
+    assert sorted((t, c, lab, len(starts)) for _, t, c, lab, starts in placed) == sorted(
+        [("A", "M1", True, 2), ("C", "L1", True, 3)] + [("A", "M1", False, 1)] * 2 + [("B", "P1", False, 1)] * 3)
+
+
+def test_place_courses_keeps_breaks_and_one_tutorial_per_day(grid):
+    random.seed(2)
+    place_courses(grid, TUTORIALS, 60, even_distribution=True)
+
+    for day in grid.days:
+        assert all(c["teacher"] is None for c in grid.cells[day] if c["is_break"])
+        teachers = [t for d, t, _, lab, _ in sessions(grid) if d == day and not lab]
+        assert len(teachers) == len(set(teachers))
+
+
+def test_place_courses_reports_what_does_not_fit():
+    grid = make_grid(days=["Monday"], start="09:00", end="11:00", break_start="11:00", break_end="11:00")
+    unplaced = place_courses(grid, [("A", "M1", "3 hours", 1, True)], 60)
+
+    assert unplaced == [("A", "M1", 1, True)]
+    assert sessions(grid) == []
+
+
+def load(routine_table):
+    from db import get_db_connection
+    from routine_grid import load_grid
+    conn = get_db_connection()
+    cur = conn.cursor()
+    grid = load_grid(cur, routine_table)
+    cur.close()
+    conn.close()
+    return grid
+
+
+def write(routine_table, grid):
+    from db import get_db_connection
+    from routine_grid import write_grid
+    conn = get_db_connection()
+    cur = conn.cursor()
+    sent = write_grid(cur, routine_table, grid)
+    conn.commit()
+    cur.close()
+    conn.close()
+    return sent
+
+
+def test_a_loaded_grid_has_no_changes(grid):
+    store_routine("diff_routine", grid)
+
+    assert load("diff_routine").changed_rows() == []
+
+
+def test_only_changed_cells_are_written(grid):
+    store_routine("diff_routine", grid)
+    loaded = load("diff_routine")
+    monday = loaded.cells["Monday"]
+    loaded.assign(monday[0], "A", "M1", False)
+    loaded.assign(monday[1], "A", "M1", False)
+    loaded.free(monday[1])
+
+    rows = loaded.changed_rows()
+    assert [(row[0], row[4]) for row in rows] == [("Monday", "A")]
+    assert write("diff_routine", loaded) == 1
+    assert write("diff_routine", loaded) == 0
+
+    stored = load("diff_routine")
+    assert stored.cells["Monday"][0]["teacher"] == "A"
+    assert stored.cells["Monday"][0]["time_slot"] == "A M1"
+    assert stored.changed_rows() == []
+
+
+def test_rescheduling_to_the_same_placement_writes_nothing(grid):
+    store_routine("diff_routine", grid)
+    loaded = load("diff_routine")
+    loaded.assign(loaded.cells["Tuesday"][2], "B", "P1", True)
+    write("diff_routine", loaded)
+
+    again = load("diff_routine")
+    slots = day_assignments(again, "Tuesday")
+    again.clear_assignments()
+    apply_day(again, "Tuesday", slots)
+    assert again.changed_rows() == []
+
+
+def test_pick_free_run_honours_the_preferred_half(grid):
+    random.seed(4)
+    starts = {prefer: {grid.pick_free_run("Monday", 2, 60, prefer)[0]["start"] for _ in range(50)}
+              for prefer in ("morning", "afternoon", None)}
+
+    assert starts["morning"] == {9 * 60, 10 * 60, 11 * 60}
+    assert starts["afternoon"] == {14 * 60, 15 * 60}
+    assert starts[None] == starts["morning"] | starts["afternoon"]
+
+
+def test_pick_free_run_falls_back_to_the_other_half(grid):
+    for cell in grid.cells["Monday"][:4]:
+        grid.assign(cell, "A", "M1", False)
+
+    assert grid.pick_free_run("Monday", 2, 60, "morning")[0]["start"] >= 14 * 60
+    assert grid.pick_free_run("Monday", 4, 60, "afternoon") is None
+
+
+def test_place_courses_with_an_afternoon_preference(grid):
+    random.seed(5)
+    place_courses(grid, [("A", "M1", "2 hours", 3, True)], 60, force_unique_days=True, prefer="afternoon")
+
+    assert all(starts[0] >= 14 * 60 for *_, starts in sessions(grid))
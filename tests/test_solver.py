@@ -0,0 +1,61 @@
+from solver import solve, apply_solution
+from conftest import make_grid, sessions
+
+LABS = [("A", "M1", "2 hours", 1, True), ("C", "L1", "3 hours", 1, True), ("D", "E1", "2 hours", 1, True)]
+TUTORIALS = [("A", "M1", "1 hour", 3, False), ("B", "P1", "1 hour", 5, False), ("D", "E1", "1 hour", 2, False)]
+
+
+def solved_grid(course_list, seed=0, **kwargs):
+    grid = make_grid()
+    result = solve(grid, course_list, 60, seed=seed, **kwargs)
+    if result.status == "complete":
+        apply_solution(grid, result)
+    return grid, result
+
+
+def test_solution_satisfies_every_constraint():
+    grid, result = solved_grid(LABS + TUTORIALS, unique_lab_days=True)
+
+    assert result.status == "complete"
+    placed = sessions(grid)
+    assert len(placed) == sum(row[3] for row in LABS + TUTORIALS)
+    for day in grid.days:
+        assert all(c["teacher"] is None for c in grid.cells[day] if c["is_break"])
+        tutors = [t for d, t, _, lab, _ in placed if d == day and not lab]
+        assert len(tutors) == len(set(tutors))
+        assert sum(1 for d, *_, lab, _ in placed if d == day and lab) <= 1
+    for _, teacher, code, is_lab, starts in placed:
+        length = {"M1": 2, "L1": 3, "E1": 2}[code] if is_lab else 1
+        assert len(starts) == length
+
+
+def test_same_seed_gives_the_same_schedule():
+    first, _ = solved_grid(LABS + TUTORIALS, seed=7)
+    second, _ = solved_grid(LABS + TUTORIALS, seed=7)
+
+    assert sessions(first) == sessions(second)
+
+
+def test_overfull_week_is_reported_infeasible():
+    # 5 days x 7 teachable slots = 35; ask for 36 one-hour tutorials
+    course_list = [(f"T{i}", f"C{i}", "1 hour", 4, False) for i in range(9)]
+    grid, result = solved_grid(course_list)
+
+    assert result.status == "infeasible"
+    assert sessions(grid) == []
+
+
+def test_lab_longer_than_any_free_run_is_infeasible_with_a_reason():
+    # Free runs are 09:00-13:00 and 14:00-17:00, so no five-hour window exists
+    _, result = solved_grid([("A", "M1", "5 hours", 1, True)])
+
+    assert result.status == "infeasible"
+    assert result.report["reasons"]
+
+
+def test_teacher_busy_windows_are_avoided():
+    busy = {"A": {day: [(9 * 60, 13 * 60)] for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]}}
+    grid, result = solved_grid([("A", "M1", "1 hour", 3, False)], teacher_busy=busy)
+
+    assert result.status == "complete"
+    assert all(start >= 14 * 60 for *_, starts in sessions(grid) for start in starts)
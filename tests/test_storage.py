@@ -0,0 +1,107 @@
+import sqlite3
+from datetime import datetime, time, timedelta
+import pytest
+from storage import StorageBackend, SQLiteBackend, translate_mysql, time_value_to_minutes
+
+
+@pytest.fixture
+def cur():
+    conn = SQLiteBackend().connect()
+    cur = conn.cursor()
+    yield cur
+    cur.close()
+    conn.close()
+
+
+def test_backends_must_implement_the_interface():
+    class Partial(StorageBackend):
+        def connect(self):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_translate_placeholders_and_show_tables():
+    assert translate_mysql("SELECT * FROM t WHERE a = %s AND b = %s") == "SELECT * FROM t WHERE a = ? AND b = ?"
+    assert translate_mysql("  show tables ") == "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"
+
+
+def test_translate_create_table_types():
+    sql = translate_mysql("""
+        CREATE TABLE IF NOT EXISTS t (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            slot_start TIME NOT NULL,
+            created_at DATETIME NOT NULL,
+            time_slot VARCHAR(100)
+        )
+    """)
+    assert "INTEGER PRIMARY KEY AUTOINCREMENT" in sql
+    assert "slot_start MYSQL_TIME NOT NULL" in sql
+    assert "created_at MYSQL_DATETIME NOT NULL" in sql
+    assert "time_slot VARCHAR(100)" in sql
+    assert "SERIAL" not in translate_mysql("CREATE TABLE s (id SERIAL PRIMARY KEY)")
+
+
+def test_translate_leaves_types_alone_outside_ddl():
+    sql = "SELECT 'TIME' FROM t"
+    assert translate_mysql(sql) == sql
+
+
+def test_translate_upsert():
+    sql = translate_mysql("""
+        INSERT INTO t (k, v) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE v = VALUES(v)
+    """)
+    assert "ON CONFLICT DO UPDATE SET v = excluded.v" in sql
+    assert "VALUES (?, ?)" in sql
+
+
+def test_upsert_and_time_round_trip(cur):
+    cur.execute("CREATE TABLE r (day VARCHAR(20), slot_start TIME, teacher VARCHAR(10), PRIMARY KEY (day, slot_start))")
+    upsert = """
+        INSERT INTO r (day, slot_start, teacher) VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE teacher = VALUES(teacher)
+    """
+    cur.executemany(upsert, [("Monday", time(9, 0), "A"), ("Monday", timedelta(hours=10), "B")])
+    cur.execute(upsert, ("Monday", timedelta(hours=9), "C"))
+
+    cur.execute("SELECT slot_start, teacher FROM r ORDER BY slot_start")
+    assert cur.fetchall() == [(timedelta(hours=9), "C"), (timedelta(hours=10), "B")]
+
+
+def test_datetime_round_trip_and_auto_increment(cur):
+    cur.execute("CREATE TABLE j (id INT AUTO_INCREMENT PRIMARY KEY, at DATETIME)")
+    when = datetime(2025, 1, 2, 3, 4, 5)
+    cur.executemany("INSERT INTO j (at) VALUES (%s)", [(when,), (when,)])
+
+    cur.execute("SELECT id, at FROM j ORDER BY id")
+    assert cur.fetchall() == [(1, when), (2, when)]
+
+
+def test_show_tables_and_ensure_index(cur):
+    cur.execute("CREATE TABLE b (x INT)")
+    cur.execute("CREATE TABLE a (x INT)")
+    backend = SQLiteBackend()
+    backend.ensure_index(cur, "a", "idx_a_x", ["x"])
+    backend.ensure_index(cur, "a", "idx_a_x", ["x"])
+
+    cur.execute("SHOW TABLES")
+    assert [row[0] for row in cur.fetchall()] == ["a", "b"]
+
+
+def test_other_sqlite3_users_are_unaffected():
+    assert (time, sqlite3.PrepareProtocol) not in sqlite3.adapters
+    assert (timedelta, sqlite3.PrepareProtocol) not in sqlite3.adapters
+
+    raw = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+    raw.execute("CREATE TABLE t (at TIME)")
+    raw.execute("INSERT INTO t VALUES ('09:30:00')")
+    assert raw.execute("SELECT at FROM t").fetchone() == ("09:30:00",)
+    raw.close()
+
+
+def test_time_values_from_any_backend():
+    assert time_value_to_minutes(timedelta(hours=9, minutes=30)) == 570
+    assert time_value_to_minutes(time(9, 30)) == 570
+    assert time_value_to_minutes("09:30:00") == 570
@@ -0,0 +1,57 @@
+import logging
+import pytest
+import routes_teacher
+from db import get_db_connection
+from teacher_index import refresh_teacher_index
+from conftest import make_grid, store_routine
+
+
+def refresh(routine_table):
+    conn = get_db_connection()
+    ok = refresh_teacher_index(conn, routine_table)
+    conn.close()
+    return ok
+
+
+@pytest.fixture
+def two_sections():
+    first = make_grid(days=["Monday"], start="09:00", end="12:00", break_start="08:00", break_end="08:00")
+    first.assign(first.cells["Monday"][0], "Ada", "M1", False)
+    first.cells["Monday"][0]["classroom"] = "R1"
+    second = make_grid(days=["Monday", "Tuesday"], start="09:00", end="12:00", break_start="08:00", break_end="08:00")
+    for cell in second.cells["Tuesday"][1:3]:
+        second.assign(cell, "Ada", "L7", True)
+    second.assign(second.cells["Monday"][2], "Bob", "P1", False)
+    store_routine("tix_1_2025_routine", first)
+    store_routine("tix_2_2025_routine", second)
+    assert refresh("tix_1_2025_routine") and refresh("tix_2_2025_routine")
+
+
+def test_teacher_page_shows_sessions_from_every_section(client, monkeypatch, two_sections):
+    monkeypatch.setattr(routes_teacher, "render_template", lambda name, **context: repr(context))
+
+    page = client.get("/teacher/Ada").get_data(as_text=True)
+
+    assert "tix_1_2025" in page and "M1" in page and "R1" in page
+    assert "tix_2_2025" in page and "L7" in page
+    assert "Bob" not in page and "P1" not in page
+
+
+def test_refresh_replaces_a_sections_rows(client, monkeypatch, two_sections):
+    monkeypatch.setattr(routes_teacher, "render_template", lambda name, **context: repr(context))
+    store_routine("tix_1_2025_routine", make_grid(days=["Monday"], start="09:00", end="12:00"))
+    refresh("tix_1_2025_routine")
+
+    page = client.get("/teacher/Ada").get_data(as_text=True)
+    assert "tix_1_2025" not in page and "tix_2_2025" in page
+
+
+def test_teacher_pdf(client, two_sections):
+    response = client.get("/teacher/Ada/pdf")
+    assert response.status_code == 200 and response.data.startswith(b"%PDF")
+
+
+def test_failed_refresh_is_logged_not_raised(caplog):
+    with caplog.at_level(logging.ERROR, logger="teacher_index"):
+        assert refresh("missing_1_2025_routine") is False
+    assert "missing_1_2025_routine" in caplog.text
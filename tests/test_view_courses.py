@@ -0,0 +1,97 @@
+import pytest
+import routes_view_courses
+from db import get_db_connection
+from table_versions import bump_table_version
+
+
+def render_page(name, courses, next_after, **context):
+    return repr({"courses": [list(row) for row in courses], "next_after": next_after})
+
+
+def stream_listing(name, courses, **context):
+    def rows():
+        yield "empty\n" if not courses else ""
+        for row in courses:
+            yield repr(list(row)) + "\n"
+    return rows()
+
+
+@pytest.fixture
+def courses(client, monkeypatch):
+    """Five courses in a fresh table; returns their listing rows in id order."""
+    monkeypatch.setattr(routes_view_courses, "render_template", render_page)
+    monkeypatch.setattr(routes_view_courses, "stream_template", stream_listing)
+    client.post("/", data=dict(branch="VC", semester="1", year="2025"))
+    with client.session_transaction() as session:
+        table = session["courses_table"]
+    set_courses(table, 5)
+    return table
+
+
+def set_courses(table, count):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute(f"DELETE FROM {table}")
+    cur.executemany(f"""
+        INSERT INTO {table} (teacher_name, course_name, course_code, tutorial_time, lab_time, tutorials_per_week, labs_per_week)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """, [(f"T{i}", f"Course {i}", f"C{i}", "1 hour", None, 1, 0) for i in range(count)])
+    conn.commit()
+    cur.close()
+    conn.close()
+    bump_table_version(table)
+
+
+def page(client, after=None, limit=2):
+    query = f"?limit={limit}" + ("" if after is None else f"&after={after}")
+    return eval(client.get("/view-courses" + query).get_data(as_text=True))
+
+
+def walk(client, limit):
+    pages = [page(client, limit=limit)]
+    while pages[-1]["next_after"] is not None:
+        pages.append(page(client, pages[-1]["next_after"], limit))
+    return pages
+
+
+def test_keyset_pages_cover_every_row_once(client, courses):
+    pages = walk(client, 2)
+
+    assert [len(p["courses"]) for p in pages] == [2, 2, 1]
+    assert [row[2] for p in pages for row in p["courses"]] == [f"C{i}" for i in range(5)]
+
+
+def test_a_page_ending_on_the_last_row_has_no_next_cursor(client, courses):
+    assert page(client, limit=5)["next_after"] is None
+    first = page(client, limit=4)
+    assert first["next_after"] is not None
+    assert page(client, first["next_after"], limit=1) == {"courses": [["T4", "Course 4", "C4", "1 hour", None, 1, 0]],
+                                                           "next_after": None}
+
+
+def test_a_page_past_the_end_is_empty(client, courses):
+    assert page(client, after=10 ** 6) == {"courses": [], "next_after": None}
+
+
+def test_streamed_listing_matches_the_pages(client, courses, monkeypatch):
+    monkeypatch.setattr(routes_view_courses, "STREAM_FETCH_SIZE", 2)
+    paged = [repr(row) for p in walk(client, 2) for row in p["courses"]]
+
+    streamed = client.get("/view-courses").get_data(as_text=True).splitlines()
+    cached = client.get("/view-courses").get_data(as_text=True).splitlines()
+
+    assert streamed == cached == paged
+
+
+def test_streamed_listing_of_an_empty_table(client, courses):
+    set_courses(courses, 0)
+    assert client.get("/view-courses").get_data(as_text=True) == "empty\n"
+
+
+def test_streaming_stops_caching_past_the_row_limit(client, courses, monkeypatch):
+    monkeypatch.setattr(routes_view_courses, "STREAM_CACHE_MAX_ROWS", 3)
+    stored = []
+    monkeypatch.setattr(routes_view_courses.query_cache, "store", lambda key, rows: stored.append(rows))
+
+    assert len(client.get("/view-courses").get_data(as_text=True).splitlines()) == 5
+    assert stored == []
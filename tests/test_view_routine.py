@@ -0,0 +1,98 @@
+import pytest
+import routes_view_routine
+from render_cache import render_cache
+from table_versions import bump_table_version
+from conftest import make_grid, store_routine
+
+
+@pytest.fixture(autouse=True)
+def section(client):
+    store_routine("etag_routine", make_grid())
+    with client.session_transaction() as session:
+        session.update(routine_table="etag_routine", branch="CSE", semester="3", year="2025",
+                       start_day="Monday", end_day="Friday")
+
+
+def no_rendering(monkeypatch):
+    """Fail the test if a request goes past the conditional check."""
+    render_cache.discard_matching(lambda key: True)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("routine was loaded for a conditional hit")
+    monkeypatch.setattr(routes_view_routine, "load_routine_view", fail)
+
+
+def test_full_response_carries_validators(client):
+    response = client.get("/download-routine")
+
+    assert response.status_code == 200
+    assert response.data.startswith(b"%PDF")
+    etag, weak = response.get_etag()
+    assert etag and weak
+    assert response.last_modified is not None
+    assert response.cache_control.private and response.cache_control.no_cache
+
+
+def test_matching_etag_is_answered_without_rendering(client, monkeypatch):
+    etag = client.get("/download-routine").headers["ETag"]
+    no_rendering(monkeypatch)
+
+    response = client.get("/download-routine", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_if_modified_since_alone_never_gives_a_304(client):
+    # Last-Modified has whole-second resolution and ignores the session's day range
+    first = client.get("/download-routine")
+    with client.session_transaction() as session:
+        session["end_day"] = "Wednesday"
+
+    response = client.get("/download-routine", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != first.headers["ETag"]
+
+
+def test_a_stale_etag_is_not_rescued_by_if_modified_since(client):
+    last_modified = client.get("/download-routine").headers["Last-Modified"]
+
+    response = client.get("/download-routine", headers={"If-None-Match": 'W/"stale"',
+                                                         "If-Modified-Since": last_modified})
+    assert response.status_code == 200
+
+
+def test_a_day_range_change_invalidates_the_etag(client):
+    etag = client.get("/download-routine").headers["ETag"]
+    with client.session_transaction() as session:
+        session["start_day"] = "Tuesday"
+
+    assert client.get("/download-routine", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_two_writes_in_the_same_second_both_invalidate(client):
+    etag = client.get("/download-routine").headers["ETag"]
+    bump_table_version("etag_routine")
+    second = client.get("/download-routine", headers={"If-None-Match": etag})
+    bump_table_version("etag_routine")
+
+    assert second.status_code == 200
+    assert client.get("/download-routine", headers={"If-None-Match": second.headers["ETag"]}).status_code == 200
+
+
+def test_a_write_invalidates_the_etag(client):
+    etag = client.get("/download-routine").headers["ETag"]
+    bump_table_version("etag_routine")
+
+    response = client.get("/download-routine", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_html_and_pdf_have_different_etags(client, monkeypatch):
+    monkeypatch.setattr(routes_view_routine, "render_template", lambda name, **context: str(context["table_rows"]))
+
+    html = client.get("/view-routine")
+    assert html.status_code == 200
+    assert html.headers["ETag"] != client.get("/download-routine").headers["ETag"]
+    assert client.get("/view-routine", headers={"If-None-Match": html.headers["ETag"]}).status_code == 304